@@ -13,19 +13,46 @@ Usage:
 
     # With custom company name
     python lead_enrichment.py --domain example.com --company "Example Corp"
+
+    # Bypass the on-disk page/enrichment cache
+    python lead_enrichment.py --domain stripe.com --no-cache
+
+    # Indent the JSON output for reading (default is compact)
+    python lead_enrichment.py --domain stripe.com --pretty
+
+    # Batch mode (domains are fetched and enriched concurrently)
+    python lead_enrichment.py --domains stripe.com shopify.com
+    echo '{"domains": ["stripe.com", "shopify.com"]}' | python lead_enrichment.py
 """
 
 import os
 import sys
 import json
+import time
+import hashlib
+import tempfile
 import argparse
-import requests
+import functools
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, FrozenSet, Mapping, TYPE_CHECKING
+from dataclasses import dataclass
+from types import MappingProxyType
 from dotenv import load_dotenv
-import anthropic
-from bs4 import BeautifulSoup
 import re
+from concurrent.futures import ThreadPoolExecutor
+
+# requests, anthropic and bs4 are imported where they are used so that
+# --help, cache hits and early errors don't pay for loading them
+if TYPE_CHECKING:
+    import anthropic
+    import requests
+    from bs4 import BeautifulSoup
+
+# orjson is optional; fall back to the stdlib parser when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Load environment variables
 load_dotenv()
@@ -40,32 +67,175 @@ MODEL_NAME = os.getenv('MODEL_NAME', 'claude-sonnet-4-5-20250929')
 MAX_TOKENS = int(os.getenv('MAX_TOKENS', '4096'))
 TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', '30'))
 ICP_CONFIG_PATH = os.getenv('ICP_CONFIG_PATH', 'icp_config.json')
+MAX_WORKERS = int(os.getenv('MAX_WORKERS', '16'))
+CACHE_DIR = os.getenv('CACHE_DIR', '.cache')
+PAGE_CACHE_TTL = 24 * 60 * 60  # 24 hours
+ENRICH_CACHE_TTL = 7 * 24 * 60 * 60  # 7 days
+MAX_PAGE_BYTES = int(os.getenv('MAX_PAGE_BYTES', str(256 * 1024)))
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+@functools.lru_cache(maxsize=None)
+def _get_session() -> 'requests.Session':
+    """
+    Shared HTTP session so batch fetches reuse pooled keep-alive connections.
+
+    Transient gateway errors (502/503/504) and connection failures are
+    retried twice with a short backoff before the fetch is reported failed.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=False,  # a 503 may ask for an hour-long wait
+        raise_on_status=False  # let raise_for_status() report the final response
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=64, pool_maxsize=64)
+
+    session = requests.Session()
+    session.headers.update({'User-Agent': USER_AGENT})
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+@functools.lru_cache(maxsize=None)
+def _get_client() -> 'anthropic.Anthropic':
+    """Shared Anthropic client so every enrichment reuses its connection pool."""
+    import anthropic
+    return anthropic.Anthropic(api_key=API_KEY)
+
+
+# ============================================================================
+# JSON HELPERS
+# ============================================================================
+
+def json_loads(data: Any) -> Any:
+    """Parse JSON from str or bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = True) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+
+def write_json(obj: Any, indent: bool = True) -> None:
+    """Write obj to stdout as JSON plus a newline, without building a joined copy."""
+    out = sys.stdout.buffer
+    out.write(json_dumps(obj, indent))
+    out.write(b'\n')
+    out.flush()
+
+
+def _utc_iso() -> str:
+    """Current UTC time as an ISO 8601 string with a Z suffix."""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+# ============================================================================
+# ON-DISK CACHE
+# ============================================================================
+
+def cache_key(*parts: str) -> str:
+    """Build a stable cache key from one or more strings."""
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+def cache_get(namespace: str, key: str, ttl: int) -> Optional[bytes]:
+    """
+    Read a cached entry if it exists and is younger than ttl seconds.
+
+    Args:
+        namespace: Cache subdirectory (e.g., 'pages', 'enrich')
+        key: Entry key from cache_key()
+        ttl: Maximum entry age in seconds
+
+    Returns:
+        Cached bytes, or None on a miss
+    """
+    path = os.path.join(CACHE_DIR, namespace, key)
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def cache_set(namespace: str, key: str, data: bytes) -> None:
+    """
+    Store a cache entry atomically. Failures are reported but never raised.
+
+    Args:
+        namespace: Cache subdirectory (e.g., 'pages', 'enrich')
+        key: Entry key from cache_key()
+        data: Bytes to store
+    """
+    directory = os.path.join(CACHE_DIR, namespace)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, os.path.join(directory, key))
+    except OSError as e:
+        print(f"Warning: Failed to write cache entry: {e}", file=sys.stderr)
 
 
 # ============================================================================
 # ICP CONFIGURATION LOADING
 # ============================================================================
 
-def load_icp_config(config_path: str = ICP_CONFIG_PATH) -> Dict[str, Any]:
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@functools.lru_cache(maxsize=4)
+def _load_icp_cached(config_path: str, mtime_ns: int) -> Mapping[str, Any]:
+    """Parse and freeze an ICP config file; mtime_ns is part of the cache key."""
+    with open(config_path, 'rb') as f:
+        return _freeze(json_loads(f.read()))
+
+
+def load_icp_config(config_path: str = ICP_CONFIG_PATH) -> Mapping[str, Any]:
     """
     Load ICP (Ideal Customer Profile) configuration from JSON file.
 
+    The parsed config is cached until the file's mtime changes, so
+    long-running callers don't re-read it for every lead. It is returned
+    read-only (nested mappings and tuples) since the cached copy is shared.
+
     Args:
         config_path: Path to ICP configuration file
 
     Returns:
-        Dictionary containing ICP criteria and scoring weights
+        Read-only mapping containing ICP criteria and scoring weights
     """
     try:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-        return config
+        return _load_icp_cached(config_path, os.stat(config_path).st_mtime_ns)
     except FileNotFoundError:
         print(f"Warning: ICP config file not found at {config_path}, using defaults", file=sys.stderr)
-        return get_default_icp_config()
+        return _freeze(get_default_icp_config())
     except json.JSONDecodeError as e:
         print(f"Warning: Invalid JSON in ICP config: {e}, using defaults", file=sys.stderr)
-        return get_default_icp_config()
+        return _freeze(get_default_icp_config())
 
 
 def get_default_icp_config() -> Dict[str, Any]:
@@ -121,51 +291,90 @@ def get_default_icp_config() -> Dict[str, Any]:
 # COMPANY DATA EXTRACTION
 # ============================================================================
 
-def fetch_company_data(domain: str, company_name: Optional[str] = None) -> Dict[str, Any]:
+def normalize_domain(domain: str) -> Tuple[str, str]:
+    """
+    Split a domain or URL into the URL to fetch and the bare domain.
+
+    Args:
+        domain: Company domain (e.g., 'stripe.com') or full URL
+
+    Returns:
+        (url, domain) tuple; bare domains are fetched over https
+    """
+    # Ensure domain has protocol
+    if not domain.startswith(('http://', 'https://')):
+        return 'https://' + domain, domain
+    # Extract domain from URL for cleaner data
+    return domain, domain.split('://')[1].split('/')[0]
+
+
+def fetch_company_data(
+    domain: str,
+    company_name: Optional[str] = None,
+    session: Optional['requests.Session'] = None,
+    use_cache: bool = True
+) -> Dict[str, Any]:
     """
     Fetch company website and extract basic information.
 
+    Only the first MAX_PAGE_BYTES of the page are downloaded. Raw HTML is
+    cached on disk for PAGE_CACHE_TTL; the parse is redone on every call
+    since it is cheap compared to refetching.
+
     Args:
         domain: Company domain (e.g., 'stripe.com')
         company_name: Optional company name if known
+        session: HTTP session to use (defaults to the shared session)
+        use_cache: Read and write the on-disk page cache
 
     Returns:
         Dictionary containing scraped company data
     """
-    try:
-        # Ensure domain has protocol
-        if not domain.startswith(('http://', 'https://')):
-            url = 'https://' + domain
-        else:
-            url = domain
-            # Extract domain from URL for cleaner data
-            domain = url.split('://')[1].split('/')[0]
-
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+    import requests
+    from bs4 import BeautifulSoup
 
-        response = requests.get(url, headers=headers, timeout=TIMEOUT)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.content, 'html.parser')
+    try:
+        url, domain = normalize_domain(domain)
+
+        page_key = cache_key(url)
+        html = cache_get('pages', page_key, PAGE_CACHE_TTL) if use_cache else None
+        status_code = 200
+
+        if html is None:
+            # Stream the body and stop at MAX_PAGE_BYTES; only the start of
+            # the page is analyzed, so there is no point downloading the rest
+            with (session or _get_session()).get(url, timeout=TIMEOUT, stream=True) as response:
+                response.raise_for_status()
+                status_code = response.status_code
+                buf = bytearray()
+                for chunk in response.iter_content(chunk_size=16384):
+                    buf.extend(chunk)
+                    if len(buf) >= MAX_PAGE_BYTES:
+                        break
+            html = bytes(buf[:MAX_PAGE_BYTES])
+            if use_cache:
+                cache_set('pages', page_key, html)
+
+        # lxml's C tokenizer is much faster than the pure-Python html.parser
+        soup = BeautifulSoup(html, 'lxml')
 
         # Extract basic SEO and content data
         title = soup.find('title')
         meta_desc = soup.find('meta', attrs={'name': 'description'})
 
         # Get page text for analysis
-        text_content = soup.get_text(separator=' ', strip=True)[:10000]
+        text_content = extract_page_text(soup, limit=10000)
 
-        # Try to detect technologies from page source
-        page_source = str(soup)[:20000]
+        # Try to detect technologies from the raw page source; the patterns are
+        # plain substrings, so there is no need to re-serialize the parsed tree
+        page_source = html[:20000].decode('utf-8', errors='replace')
         detected_tech = detect_technologies(page_source)
 
         # Look for social links
         social_links = extract_social_links(soup)
 
         # Extract company name from title if not provided
-        if not company_name and title:
+        if not company_name and title and title.string:
             company_name = extract_company_name(title.string)
 
         return {
@@ -177,9 +386,9 @@ def fetch_company_data(domain: str, company_name: Optional[str] = None) -> Dict[
             'text_content': text_content,
             'detected_technologies': detected_tech,
             'social_links': social_links,
-            'status_code': response.status_code,
+            'status_code': status_code,
             'has_https': url.startswith('https://'),
-            'fetch_timestamp': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+            'fetch_timestamp': _utc_iso()
         }
 
     except requests.RequestException as e:
@@ -191,6 +400,82 @@ def fetch_company_data(domain: str, company_name: Optional[str] = None) -> Dict[
         }
 
 
+# Technology fingerprints, scanned in a single pass as one alternation.
+# Group names must be valid identifiers, so each technology gets a slug.
+TECH_PATTERNS = [
+    ('react', 'React', r'react'),
+    ('vuejs', 'Vue.js', r'vue'),
+    ('angular', 'Angular', r'angular'),
+    ('wordpress', 'WordPress', r'wp-content|wordpress'),
+    ('shopify', 'Shopify', r'shopify'),
+    ('stripe', 'Stripe', r'stripe'),
+    ('google_analytics', 'Google Analytics', r'google-analytics|gtag'),
+    ('hubspot', 'HubSpot', r'hubspot'),
+    ('salesforce', 'Salesforce', r'salesforce'),
+    ('intercom', 'Intercom', r'intercom'),
+    ('aws', 'AWS', r'amazonaws'),
+    ('cloudflare', 'Cloudflare', r'cloudflare'),
+    ('nodejs', 'Node.js', r'node\.js'),
+    ('nextjs', 'Next.js', r'next\.js|__next')
+]
+
+_TECH_RE = re.compile(
+    '|'.join(f'(?P<{slug}>{pattern})' for slug, _, pattern in TECH_PATTERNS),
+    re.IGNORECASE
+)
+
+SOCIAL_PATTERNS = [
+    ('linkedin', r'linkedin\.com'),
+    ('twitter', r'twitter\.com|x\.com'),
+    ('facebook', r'facebook\.com'),
+    ('instagram', r'instagram\.com'),
+    ('youtube', r'youtube\.com'),
+    ('github', r'github\.com')
+]
+
+_SOCIAL_RE = re.compile(
+    '|'.join(f'(?P<{platform}>{pattern})' for platform, pattern in SOCIAL_PATTERNS),
+    re.IGNORECASE
+)
+
+
+def fetch_many(
+    domains: List[str],
+    max_workers: int = MAX_WORKERS,
+    use_cache: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Fetch several company websites concurrently.
+
+    Args:
+        domains: Company domains to fetch
+        max_workers: Maximum number of concurrent fetches
+        use_cache: Read and write the on-disk page cache
+
+    Returns:
+        Scraped company data for each domain, in input order. A domain that
+        fails unexpectedly gets an error entry rather than aborting the batch.
+    """
+    if not domains:
+        return []
+
+    session = _get_session()
+
+    def fetch_one(domain: str) -> Dict[str, Any]:
+        try:
+            return fetch_company_data(domain, session=session, use_cache=use_cache)
+        except Exception as e:
+            return {
+                'domain': domain,
+                'company_name': None,
+                'error': str(e),
+                'text_content': ''
+            }
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(domains))) as executor:
+        return list(executor.map(fetch_one, domains))
+
+
 def detect_technologies(page_source: str) -> List[str]:
     """
     Detect technologies used based on page source analysis.
@@ -201,34 +486,16 @@ def detect_technologies(page_source: str) -> List[str]:
     Returns:
         List of detected technologies
     """
-    tech_patterns = {
-        'React': r'react',
-        'Vue.js': r'vue',
-        'Angular': r'angular',
-        'WordPress': r'wp-content|wordpress',
-        'Shopify': r'shopify',
-        'Stripe': r'stripe',
-        'Google Analytics': r'google-analytics|gtag',
-        'HubSpot': r'hubspot',
-        'Salesforce': r'salesforce',
-        'Intercom': r'intercom',
-        'AWS': r'amazonaws',
-        'Cloudflare': r'cloudflare',
-        'Node.js': r'node\.js',
-        'Next.js': r'next\.js|__next'
-    }
-
-    detected = []
-    page_lower = page_source.lower()
-
-    for tech, pattern in tech_patterns.items():
-        if re.search(pattern, page_lower, re.IGNORECASE):
-            detected.append(tech)
+    found = set()
+    for match in _TECH_RE.finditer(page_source):
+        found.add(match.lastgroup)
+        if len(found) == len(TECH_PATTERNS):
+            break
 
-    return detected
+    return [name for slug, name, _ in TECH_PATTERNS if slug in found]
 
 
-def extract_social_links(soup: BeautifulSoup) -> Dict[str, str]:
+def extract_social_links(soup: 'BeautifulSoup') -> Dict[str, str]:
     """
     Extract social media links from page.
 
@@ -239,25 +506,40 @@ def extract_social_links(soup: BeautifulSoup) -> Dict[str, str]:
         Dictionary of social platform: URL
     """
     social_links = {}
-    social_patterns = {
-        'linkedin': r'linkedin\.com',
-        'twitter': r'twitter\.com|x\.com',
-        'facebook': r'facebook\.com',
-        'instagram': r'instagram\.com',
-        'youtube': r'youtube\.com',
-        'github': r'github\.com'
-    }
 
-    links = soup.find_all('a', href=True)
-    for link in links:
+    for link in soup.find_all('a', href=True):
         href = link.get('href', '')
-        for platform, pattern in social_patterns.items():
-            if re.search(pattern, href, re.IGNORECASE) and platform not in social_links:
-                social_links[platform] = href
+        match = _SOCIAL_RE.search(href)
+        if match and match.lastgroup not in social_links:
+            social_links[match.lastgroup] = href
 
     return social_links
 
 
+def extract_page_text(soup: 'BeautifulSoup', limit: int = 10000) -> str:
+    """
+    Extract visible page text, truncated to a character limit.
+
+    Equivalent to soup.get_text(separator=' ', strip=True)[:limit], but stops
+    walking the tree once enough text has been collected.
+
+    Args:
+        soup: BeautifulSoup parsed HTML
+        limit: Maximum number of characters to return
+
+    Returns:
+        Space-separated page text
+    """
+    parts = []
+    total = 0
+    for text in soup.stripped_strings:
+        parts.append(text)
+        total += len(text) + 1
+        if total > limit:
+            break
+    return ' '.join(parts)[:limit]
+
+
 def extract_company_name(title: str) -> str:
     """
     Extract company name from page title.
@@ -279,91 +561,171 @@ def extract_company_name(title: str) -> str:
 # AI-POWERED ENRICHMENT
 # ============================================================================
 
-def enrich_company_data(company_data: Dict[str, Any], icp_config: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Use Claude to enrich company data with additional insights.
-
-    Args:
-        company_data: Basic company data from web scraping
-        icp_config: ICP configuration for context
-
-    Returns:
-        Enriched company data dictionary
-    """
-    if not API_KEY:
-        raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
-
-    client = anthropic.Anthropic(api_key=API_KEY)
-
-    # Build enrichment prompt
-    prompt = f"""You are a B2B sales intelligence analyst enriching company data for lead qualification.
-
-COMPANY INFORMATION:
-- Domain: {company_data.get('domain', 'Unknown')}
-- Company Name: {company_data.get('company_name', 'Unknown')}
-- Website Title: {company_data.get('title', 'Not found')}
-- Meta Description: {company_data.get('meta_description', 'Not found')}
-- Detected Technologies: {company_data.get('detected_technologies', [])}
-- Social Presence: {list(company_data.get('social_links', {}).keys())}
-- Website Content Sample: {company_data.get('text_content', '')[:5000]}
-
-Based on the available information, provide a comprehensive company enrichment analysis in the following JSON structure:
-
-{{
-  "company_profile": {{
+ENRICHMENT_SCHEMA = """{
+  "company_profile": {
     "name": "official company name",
     "industry": "primary industry (e.g., SaaS, FinTech, E-commerce)",
     "business_model": "B2B/B2C/Marketplace/etc",
     "description": "2-3 sentence company description",
     "headquarters_location": "city, country (if detectable from content)",
     "website_quality": "excellent|good|average|poor"
-  }},
-  "company_size": {{
+  },
+  "company_size": {
     "estimated_employees": <number or null>,
     "size_category": "enterprise|mid-market|small|startup",
     "confidence": "high|medium|low",
     "reasoning": "brief explanation of estimate"
-  }},
-  "funding_and_growth": {{
+  },
+  "funding_and_growth": {
     "funding_stage": "Bootstrap|Seed|Series A|Series B|Series C|Growth|Public|Unknown",
     "growth_indicators": ["indicator1", "indicator2"],
     "is_hiring": true/false,
     "expansion_signals": ["signal1", "signal2"]
-  }},
-  "technology_stack": {{
+  },
+  "technology_stack": {
     "confirmed_technologies": ["tech1", "tech2"],
     "likely_technologies": ["tech3", "tech4"],
     "technical_sophistication": "high|medium|low",
     "infrastructure": "cloud|hybrid|on-premise|unknown"
-  }},
-  "market_presence": {{
+  },
+  "market_presence": {
     "brand_maturity": "established|growing|emerging|unknown",
     "content_marketing": true/false,
     "seo_quality": "excellent|good|average|poor",
     "social_media_activity": "active|moderate|minimal|none",
     "thought_leadership": true/false
-  }},
-  "business_intelligence": {{
+  },
+  "business_intelligence": {
     "target_customers": "description of their customers",
     "value_proposition": "their core value prop",
     "competitive_positioning": "assessment",
     "revenue_model": "subscription|transaction|advertising|service|product|mixed|unknown"
-  }},
-  "contact_indicators": {{
+  },
+  "contact_indicators": {
     "has_contact_page": true/false,
     "has_demo_cta": true/false,
     "has_pricing_page": true/false,
     "sales_readiness": "high|medium|low"
-  }}
-}}
+  }
+}"""
 
-Provide ONLY the JSON output, no additional text. Be specific and realistic in your assessments. If information is not available, use "unknown" or null rather than guessing."""
+ENRICH_BATCH_SIZE = int(os.getenv('ENRICH_BATCH_SIZE', '8'))
+
+# Non-streaming requests are capped well below the SDK's long-request limit
+BATCH_MAX_TOKENS = 16000
+
+
+def format_company_info(company_data: Dict[str, Any]) -> str:
+    """Render scraped company data as the COMPANY INFORMATION prompt block."""
+    return f"""- Domain: {company_data.get('domain', 'Unknown')}
+- Company Name: {company_data.get('company_name', 'Unknown')}
+- Website Title: {company_data.get('title', 'Not found')}
+- Meta Description: {company_data.get('meta_description', 'Not found')}
+- Detected Technologies: {company_data.get('detected_technologies', [])}
+- Social Presence: {list(company_data.get('social_links', {}).keys())}
+- Website Content Sample: {company_data.get('text_content', '')[:5000]}"""
+
+
+def _balanced_end(text: str, start: int) -> int:
+    """
+    Index just past the bracketed value opening at text[start], or -1.
+
+    Tracks bracket depth and skips brackets inside string literals.
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            depth += 1
+        elif char in '}]':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return -1
+
+
+def _has_expected_shape(value: Any, opener: str) -> bool:
+    """True if value is an object, or for '[' a list of objects."""
+    if opener == '[':
+        return isinstance(value, list) and all(isinstance(item, dict) for item in value)
+    return isinstance(value, dict)
+
+
+def _extract_json_object(text: str, opener: str = '{') -> Any:
+    """
+    Parse the first JSON value opening with `opener` out of a Claude reply.
+
+    Claude sometimes wraps its JSON in markdown fences or adds a sentence
+    around it, which may itself contain brackets (e.g. "company [0]"). Each
+    `opener` position is tried in turn; the first balanced slice that parses
+    to the expected shape (an object, or a list of objects) is returned.
+
+    Args:
+        text: Raw response text
+        opener: '{' for a single object, '[' when an array is expected
+
+    Returns:
+        The parsed JSON value
+
+    Raises:
+        json.JSONDecodeError: If no candidate slice parses to the expected shape
+    """
+    start = text.find(opener)
+    first = start
+    while start != -1:
+        end = _balanced_end(text, start)
+        if end == -1:
+            break
+        try:
+            value = json_loads(text[start:end])
+            if _has_expected_shape(value, opener):
+                return value
+        except ValueError:
+            pass
+        start = text.find(opener, start + 1)
+
+    # Nothing usable (e.g. truncated at max_tokens); let the parser report it
+    value = json_loads(text[first:] if first != -1 else text)
+    if not _has_expected_shape(value, opener):
+        expected = 'an array of objects' if opener == '[' else 'an object'
+        raise json.JSONDecodeError(f'Expected {expected}', text, max(first, 0))
+    return value
+
+
+def request_enrichment(prompt: str, max_tokens: int = MAX_TOKENS, expect_array: bool = False) -> Any:
+    """
+    Send an enrichment prompt to Claude and parse the JSON reply.
+
+    Args:
+        prompt: Complete enrichment prompt
+        max_tokens: Maximum tokens for the response
+        expect_array: The reply should be a JSON array rather than an object
+
+    Returns:
+        Parsed JSON response
+    """
+    if not API_KEY:
+        raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
+
+    import anthropic
+    client = _get_client()
 
     try:
         # Call Claude API
         message = client.messages.create(
             model=MODEL_NAME,
-            max_tokens=MAX_TOKENS,
+            max_tokens=max_tokens,
             messages=[
                 {"role": "user", "content": prompt}
             ]
@@ -372,14 +734,8 @@ Provide ONLY the JSON output, no additional text. Be specific and realistic in y
         # Extract response text
         response_text = message.content[0].text
 
-        # Parse JSON from response
-        if '```json' in response_text:
-            response_text = response_text.split('```json')[1].split('```')[0].strip()
-        elif '```' in response_text:
-            response_text = response_text.split('```')[1].split('```')[0].strip()
-
-        enrichment_data = json.loads(response_text)
-        return enrichment_data
+        # Parse JSON from response, ignoring any fences or surrounding prose
+        return _extract_json_object(response_text, '[' if expect_array else '{')
 
     except anthropic.APIError as e:
         raise Exception(f"Anthropic API error: {str(e)}")
@@ -387,55 +743,371 @@ Provide ONLY the JSON output, no additional text. Be specific and realistic in y
         raise Exception(f"Failed to parse Claude's response as JSON: {str(e)}")
 
 
+def enrichment_cache_key(
+    domain: str,
+    icp_config: Dict[str, Any],
+    company_name: Optional[str] = None
+) -> str:
+    """
+    Cache key for a company's enrichment.
+
+    The key covers the bare domain, the caller-supplied company name, the
+    model, and the ICP configuration, so changing any of them invalidates
+    old entries. It depends only on the request, so the cache can be
+    checked before the website is fetched.
+    """
+    icp_fingerprint = json.dumps(icp_config, sort_keys=True, default=dict)
+    return cache_key(normalize_domain(domain)[1], company_name or '', MODEL_NAME, icp_fingerprint)
+
+
+def load_cached_enrichment(key: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Cached enrichment for key, or None on a miss or a malformed entry."""
+    cached = cache_get('enrich', key, ENRICH_CACHE_TTL) if key else None
+    if cached is None:
+        return None
+    try:
+        enrichment_data = json_loads(cached)
+    except ValueError:
+        return None
+    return enrichment_data if isinstance(enrichment_data, dict) else None
+
+
+def enrich_company_data(
+    company_data: Dict[str, Any],
+    icp_config: Dict[str, Any],
+    use_cache: bool = True,
+    company_name: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Use Claude to enrich company data with additional insights.
+
+    Enrichments built from a failed website fetch are never cached.
+
+    Args:
+        company_data: Basic company data from web scraping
+        icp_config: ICP configuration for context
+        use_cache: Read and write the on-disk enrichment cache
+        company_name: Company name supplied by the caller, part of the cache key
+
+    Returns:
+        Enriched company data dictionary
+    """
+    key = None
+    if use_cache and 'error' not in company_data:
+        key = enrichment_cache_key(company_data.get('domain', ''), icp_config, company_name)
+    cached = load_cached_enrichment(key)
+    if cached is not None:
+        return cached
+
+    # Build enrichment prompt
+    prompt = f"""You are a B2B sales intelligence analyst enriching company data for lead qualification.
+
+COMPANY INFORMATION:
+{format_company_info(company_data)}
+
+Based on the available information, provide a comprehensive company enrichment analysis in the following JSON structure:
+
+{ENRICHMENT_SCHEMA}
+
+Provide ONLY the JSON output, no additional text. Be specific and realistic in your assessments. If information is not available, use "unknown" or null rather than guessing."""
+
+    enrichment_data = request_enrichment(prompt)
+    if key:
+        cache_set('enrich', key, json_dumps(enrichment_data, indent=False))
+    return enrichment_data
+
+
+def enrich_company_data_batch(
+    companies: List[Dict[str, Any]],
+    icp_config: Dict[str, Any],
+    batch_size: int = ENRICH_BATCH_SIZE,
+    use_cache: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Enrich several companies with one Claude request per batch.
+
+    Each request labels the companies "Company 1".."Company K" and asks for a
+    JSON array of enrichments in the same order, amortizing the per-request overhead.
+    Companies with a cached enrichment are not sent to Claude.
+
+    Args:
+        companies: Basic company data from web scraping
+        icp_config: ICP configuration for context
+        batch_size: Maximum number of companies per Claude request
+        use_cache: Read and write the on-disk enrichment cache
+
+    Returns:
+        Enriched company data dictionaries, in input order
+    """
+    enriched: List[Optional[Dict[str, Any]]] = [None] * len(companies)
+    keys = [
+        enrichment_cache_key(company_data.get('domain', ''), icp_config)
+        if use_cache and 'error' not in company_data else None
+        for company_data in companies
+    ]
+
+    pending = []
+    for index, key in enumerate(keys):
+        cached = load_cached_enrichment(key)
+        if cached is not None:
+            enriched[index] = cached
+        else:
+            pending.append(index)
+
+    for start in range(0, len(pending), batch_size):
+        indexes = pending[start:start + batch_size]
+        chunk = [companies[index] for index in indexes]
+        company_blocks = '\n\n'.join(
+            f"Company {i}:\n{format_company_info(company_data)}"
+            for i, company_data in enumerate(chunk, 1)
+        )
+
+        prompt = f"""You are a B2B sales intelligence analyst enriching company data for lead qualification.
+
+You are given {len(chunk)} companies, labeled Company 1 to Company {len(chunk)}.
+
+{company_blocks}
+
+Based on the available information, provide a comprehensive company enrichment analysis for EACH company in the following JSON structure:
+
+{ENRICHMENT_SCHEMA}
+
+Return a JSON array containing exactly {len(chunk)} of these objects, in the same order as the companies above (the first element describes Company 1, and so on).
+
+Provide ONLY the JSON output, no additional text. Be specific and realistic in your assessments. If information is not available, use "unknown" or null rather than guessing."""
+
+        results = request_enrichment(
+            prompt,
+            max_tokens=min(MAX_TOKENS * len(chunk), BATCH_MAX_TOKENS),
+            expect_array=True
+        )
+        if (not isinstance(results, list) or len(results) != len(chunk)
+                or not all(isinstance(item, dict) for item in results)):
+            raise Exception(f"Expected a JSON array of {len(chunk)} enrichment objects from Claude")
+
+        for index, enrichment_data in zip(indexes, results):
+            enriched[index] = enrichment_data
+            if keys[index]:
+                cache_set('enrich', keys[index], json_dumps(enrichment_data, indent=False))
+
+    return enriched
+
+
 # ============================================================================
 # LEAD SCORING ENGINE
 # ============================================================================
 
-def score_lead(enriched_data: Dict[str, Any], icp_config: Dict[str, Any]) -> Dict[str, Any]:
+# Raw scores for the categorical signals Claude reports. Anything not listed
+# falls through to the scorer's default.
+SIZE_CATEGORY_SCORES = {
+    'mid-market': 90,
+    'small': 70,
+    'enterprise': 60,
+    'startup': 50,
+}
+TECH_MATCH_SCORES = {3: 100, 2: 80, 1: 60}  # by ideal-tech matches, capped at 3
+TECH_SOPHISTICATION_SCORES = {'high': 70, 'medium': 50}
+GROWTH_SIGNAL_SCORES = (20, 40, 60, 80, 100)  # indexed by signal count, capped at 4
+BRAND_MATURITY_SCORES = {'established': 30, 'growing': 20}
+SEO_QUALITY_SCORES = {'excellent': 25, 'good': 25, 'average': 15}
+SOCIAL_ACTIVITY_SCORES = {'active': 25, 'moderate': 25, 'minimal': 10}
+CONTENT_MARKETING_SCORE = 20
+
+
+@dataclass(frozen=True)
+class LeadFeatures:
+    """
+    Flattened view of the enriched fields the scorers read.
+
+    Built once per lead so each scorer reads attributes instead of walking
+    the nested enrichment dicts. Raw values are kept alongside the case-folded
+    ones because they are echoed back in the score breakdown.
+    """
+    __slots__ = (
+        'estimated_employees', 'size_category',
+        'industry', 'industry_folded',
+        'funding_stage', 'funding_stage_folded',
+        'technologies', 'technologies_folded', 'tech_sophistication',
+        'is_hiring', 'growth_signal_count',
+        'brand_maturity', 'content_marketing', 'seo_quality', 'social_activity',
+    )
+
+    estimated_employees: Optional[int]
+    size_category: str
+    industry: str
+    industry_folded: str
+    funding_stage: str
+    funding_stage_folded: str
+    technologies: Tuple[str, ...]
+    technologies_folded: Tuple[str, ...]
+    tech_sophistication: str
+    is_hiring: bool
+    growth_signal_count: int
+    brand_maturity: str
+    content_marketing: bool
+    seo_quality: str
+    social_activity: str
+
+    @classmethod
+    def from_enriched(cls, data: Dict[str, Any]) -> 'LeadFeatures':
+        """
+        Extract scoring features from Claude's enrichment output.
+
+        Args:
+            data: Enriched company data
+
+        Returns:
+            LeadFeatures for the lead
+        """
+        size_data = data.get('company_size') or {}
+        profile = data.get('company_profile') or {}
+        growth = data.get('funding_and_growth') or {}
+        tech = data.get('technology_stack') or {}
+        presence = data.get('market_presence') or {}
+
+        industry = profile.get('industry') or 'unknown'
+        funding_stage = growth.get('funding_stage') or 'unknown'
+        technologies = tuple(tech.get('confirmed_technologies') or ()) + tuple(tech.get('likely_technologies') or ())
+        is_hiring = growth.get('is_hiring', False)
+        signal_count = (
+            len(growth.get('growth_indicators') or ())
+            + len(growth.get('expansion_signals') or ())
+            + (1 if is_hiring else 0)
+        )
+
+        return cls(
+            estimated_employees=size_data.get('estimated_employees'),
+            size_category=size_data.get('size_category', 'unknown'),
+            industry=industry,
+            industry_folded=industry.casefold(),
+            funding_stage=funding_stage,
+            funding_stage_folded=funding_stage.casefold(),
+            technologies=technologies,
+            technologies_folded=tuple(t.casefold() for t in technologies),
+            tech_sophistication=tech.get('technical_sophistication', 'low'),
+            is_hiring=is_hiring,
+            growth_signal_count=signal_count,
+            brand_maturity=presence.get('brand_maturity', 'unknown'),
+            content_marketing=presence.get('content_marketing', False),
+            seo_quality=presence.get('seo_quality', 'poor'),
+            social_activity=presence.get('social_media_activity', 'none'),
+        )
+
+
+@dataclass(frozen=True)
+class ScoreSpec:
+    """
+    ICP criteria pre-processed for scoring.
+
+    Weights, the size range and the case-folded ideal-value lists are the same
+    for every lead, so they are extracted once per config instead of once
+    per lead.
+    """
+    __slots__ = (
+        'size_weight', 'size_range',
+        'industry_weight', 'ideal_industries', 'ideal_industry_set',
+        'funding_weight', 'ideal_stages', 'ideal_stage_set',
+        'tech_weight', 'ideal_technologies',
+        'growth_weight', 'market_weight',
+    )
+
+    size_weight: float
+    size_range: Tuple[float, float]
+    industry_weight: float
+    ideal_industries: Tuple[str, ...]
+    ideal_industry_set: FrozenSet[str]
+    funding_weight: float
+    ideal_stages: Tuple[str, ...]
+    ideal_stage_set: FrozenSet[str]
+    tech_weight: float
+    ideal_technologies: Tuple[str, ...]
+    growth_weight: float
+    market_weight: float
+
+
+def build_score_spec(icp_config: Dict[str, Any]) -> ScoreSpec:
+    """
+    Build the per-config scoring spec from an ICP configuration.
+
+    Args:
+        icp_config: ICP configuration with criteria and weights
+
+    Returns:
+        ScoreSpec for use with score_lead
+    """
+    criteria = icp_config['icp_criteria']
+    industries = tuple(ind.casefold() for ind in criteria['industry']['ideal_industries'])
+    stages = tuple(stage.casefold() for stage in criteria['funding_stage']['ideal_stages'])
+    low, high = criteria['company_size']['ideal_range']
+
+    return ScoreSpec(
+        size_weight=criteria['company_size']['weight'],
+        size_range=(low, high),
+        industry_weight=criteria['industry']['weight'],
+        ideal_industries=industries,
+        ideal_industry_set=frozenset(industries),
+        funding_weight=criteria['funding_stage']['weight'],
+        ideal_stages=stages,
+        ideal_stage_set=frozenset(stages),
+        tech_weight=criteria['tech_stack']['weight'],
+        ideal_technologies=tuple(tech.casefold() for tech in criteria['tech_stack']['ideal_technologies']),
+        growth_weight=criteria['growth_signals']['weight'],
+        market_weight=criteria['market_presence']['weight'],
+    )
+
+
+def score_lead(
+    enriched_data: Dict[str, Any],
+    icp_config: Dict[str, Any],
+    spec: Optional[ScoreSpec] = None
+) -> Dict[str, Any]:
     """
     Score lead based on ICP fit criteria.
 
     Args:
         enriched_data: Enriched company data
         icp_config: ICP configuration with criteria and weights
+        spec: Prebuilt spec for icp_config; pass one when scoring many leads
 
     Returns:
         Scoring results with breakdown
     """
-    criteria = icp_config['icp_criteria']
+    if spec is None:
+        spec = build_score_spec(icp_config)
     thresholds = icp_config['scoring_thresholds']
+    features = LeadFeatures.from_enriched(enriched_data)
 
     scores = {}
     total_score = 0
     max_possible = 100
 
     # Score company size
-    size_score = score_company_size(enriched_data, criteria['company_size'])
+    size_score = score_company_size(features, spec)
     scores['company_size'] = size_score
     total_score += size_score['weighted_score']
 
     # Score industry
-    industry_score = score_industry(enriched_data, criteria['industry'])
+    industry_score = score_industry(features, spec)
     scores['industry'] = industry_score
     total_score += industry_score['weighted_score']
 
     # Score funding stage
-    funding_score = score_funding(enriched_data, criteria['funding_stage'])
+    funding_score = score_funding(features, spec)
     scores['funding_stage'] = funding_score
     total_score += funding_score['weighted_score']
 
     # Score tech stack
-    tech_score = score_tech_stack(enriched_data, criteria['tech_stack'])
+    tech_score = score_tech_stack(features, spec)
     scores['tech_stack'] = tech_score
     total_score += tech_score['weighted_score']
 
     # Score growth signals
-    growth_score = score_growth_signals(enriched_data, criteria['growth_signals'])
+    growth_score = score_growth_signals(features, spec)
     scores['growth_signals'] = growth_score
     total_score += growth_score['weighted_score']
 
     # Score market presence
-    market_score = score_market_presence(enriched_data, criteria['market_presence'])
+    market_score = score_market_presence(features, spec)
     scores['market_presence'] = market_score
     total_score += market_score['weighted_score']
 
@@ -453,33 +1125,21 @@ def score_lead(enriched_data: Dict[str, Any], icp_config: Dict[str, Any]) -> Dic
         'total_score': round(total_score, 1),
         'max_score': max_possible,
         'category': category,
-        'category_thresholds': thresholds,
+        'category_thresholds': dict(thresholds),
         'score_breakdown': scores,
         'recommendation': get_recommendation(category, total_score)
     }
 
 
-def score_company_size(data: Dict[str, Any], criteria: Dict[str, Any]) -> Dict[str, Any]:
+def score_company_size(features: LeadFeatures, spec: ScoreSpec) -> Dict[str, Any]:
     """Score based on company size criteria."""
-    weight = criteria['weight']
-    ideal_range = criteria['ideal_range']
-
-    size_data = data.get('company_size', {})
-    estimated_employees = size_data.get('estimated_employees')
+    weight = spec.size_weight
+    ideal_range = spec.size_range
+    estimated_employees = features.estimated_employees
 
     if estimated_employees is None:
         # Fallback to size category
-        size_category = size_data.get('size_category', 'unknown')
-        if size_category == 'mid-market':
-            raw_score = 90
-        elif size_category == 'small':
-            raw_score = 70
-        elif size_category == 'enterprise':
-            raw_score = 60
-        elif size_category == 'startup':
-            raw_score = 50
-        else:
-            raw_score = 40
+        raw_score = SIZE_CATEGORY_SCORES.get(features.size_category, 40)
     else:
         # Score based on employee count
         if ideal_range[0] <= estimated_employees <= ideal_range[1]:
@@ -489,23 +1149,24 @@ def score_company_size(data: Dict[str, Any], criteria: Dict[str, Any]) -> Dict[s
         else:
             raw_score = max(40, 100 - (estimated_employees - ideal_range[1]) * 0.2)
 
+    value = estimated_employees or features.size_category
     return {
         'raw_score': round(raw_score, 1),
         'weighted_score': round((raw_score * weight) / 100, 1),
         'weight': weight,
-        'value': estimated_employees or size_data.get('size_category', 'unknown'),
-        'reasoning': f"Company size: {estimated_employees or size_data.get('size_category', 'unknown')}"
+        'value': value,
+        'reasoning': f"Company size: {value}"
     }
 
 
-def score_industry(data: Dict[str, Any], criteria: Dict[str, Any]) -> Dict[str, Any]:
+def score_industry(features: LeadFeatures, spec: ScoreSpec) -> Dict[str, Any]:
     """Score based on industry match."""
-    weight = criteria['weight']
-    ideal_industries = [ind.lower() for ind in criteria['ideal_industries']]
-
-    industry = data.get('company_profile', {}).get('industry', 'unknown').lower()
+    weight = spec.industry_weight
+    industry = features.industry_folded
 
-    if any(ideal in industry for ideal in ideal_industries):
+    # Exact hits are a set lookup; fall back to substring matching so
+    # "B2B SaaS platform" still matches "saas"
+    if industry in spec.ideal_industry_set or any(ideal in industry for ideal in spec.ideal_industries):
         raw_score = 100
     elif 'tech' in industry or 'software' in industry or 'digital' in industry:
         raw_score = 70
@@ -516,19 +1177,17 @@ def score_industry(data: Dict[str, Any], criteria: Dict[str, Any]) -> Dict[str,
         'raw_score': round(raw_score, 1),
         'weighted_score': round((raw_score * weight) / 100, 1),
         'weight': weight,
-        'value': data.get('company_profile', {}).get('industry', 'unknown'),
-        'reasoning': f"Industry: {data.get('company_profile', {}).get('industry', 'unknown')}"
+        'value': features.industry,
+        'reasoning': f"Industry: {features.industry}"
     }
 
 
-def score_funding(data: Dict[str, Any], criteria: Dict[str, Any]) -> Dict[str, Any]:
+def score_funding(features: LeadFeatures, spec: ScoreSpec) -> Dict[str, Any]:
     """Score based on funding stage."""
-    weight = criteria['weight']
-    ideal_stages = [stage.lower() for stage in criteria['ideal_stages']]
+    weight = spec.funding_weight
+    funding_stage = features.funding_stage_folded
 
-    funding_stage = data.get('funding_and_growth', {}).get('funding_stage', 'unknown').lower()
-
-    if any(stage in funding_stage for stage in ideal_stages):
+    if funding_stage in spec.ideal_stage_set or any(stage in funding_stage for stage in spec.ideal_stages):
         raw_score = 100
     elif 'bootstrap' in funding_stage or 'seed' in funding_stage:
         raw_score = 60
@@ -541,107 +1200,62 @@ def score_funding(data: Dict[str, Any], criteria: Dict[str, Any]) -> Dict[str, A
         'raw_score': round(raw_score, 1),
         'weighted_score': round((raw_score * weight) / 100, 1),
         'weight': weight,
-        'value': data.get('funding_and_growth', {}).get('funding_stage', 'unknown'),
-        'reasoning': f"Funding: {data.get('funding_and_growth', {}).get('funding_stage', 'unknown')}"
+        'value': features.funding_stage,
+        'reasoning': f"Funding: {features.funding_stage}"
     }
 
 
-def score_tech_stack(data: Dict[str, Any], criteria: Dict[str, Any]) -> Dict[str, Any]:
+def score_tech_stack(features: LeadFeatures, spec: ScoreSpec) -> Dict[str, Any]:
     """Score based on technology stack match."""
-    weight = criteria['weight']
-    ideal_tech = [tech.lower() for tech in criteria['ideal_technologies']]
-
-    confirmed = data.get('technology_stack', {}).get('confirmed_technologies', [])
-    likely = data.get('technology_stack', {}).get('likely_technologies', [])
-    all_tech = [t.lower() for t in (confirmed + likely)]
+    weight = spec.tech_weight
+    all_tech = features.technologies_folded
 
-    matches = sum(1 for tech in ideal_tech if any(t in tech_item for tech_item in all_tech for t in [tech]))
-    tech_sophistication = data.get('technology_stack', {}).get('technical_sophistication', 'low')
+    # One substring search per ideal technology over the newline-joined
+    # stack, run by map in C, instead of a nested generator over every pair
+    tech_text = '\n'.join(all_tech)
+    matches = sum(map(tech_text.__contains__, spec.ideal_technologies)) if all_tech else 0
+    tech_sophistication = features.tech_sophistication
 
-    if matches >= 3:
-        raw_score = 100
-    elif matches == 2:
-        raw_score = 80
-    elif matches == 1:
-        raw_score = 60
-    elif tech_sophistication == 'high':
-        raw_score = 70
-    elif tech_sophistication == 'medium':
-        raw_score = 50
+    if matches:
+        raw_score = TECH_MATCH_SCORES[min(matches, 3)]
     else:
-        raw_score = 30
+        raw_score = TECH_SOPHISTICATION_SCORES.get(tech_sophistication, 30)
 
     return {
         'raw_score': round(raw_score, 1),
         'weighted_score': round((raw_score * weight) / 100, 1),
         'weight': weight,
-        'value': confirmed + likely,
+        'value': list(features.technologies),
         'reasoning': f"Tech matches: {matches}, Sophistication: {tech_sophistication}"
     }
 
 
-def score_growth_signals(data: Dict[str, Any], criteria: Dict[str, Any]) -> Dict[str, Any]:
+def score_growth_signals(features: LeadFeatures, spec: ScoreSpec) -> Dict[str, Any]:
     """Score based on growth indicators."""
-    weight = criteria['weight']
-
-    growth_data = data.get('funding_and_growth', {})
-    is_hiring = growth_data.get('is_hiring', False)
-    growth_indicators = growth_data.get('growth_indicators', [])
-    expansion_signals = growth_data.get('expansion_signals', [])
+    weight = spec.growth_weight
+    signal_count = features.growth_signal_count
 
-    signal_count = len(growth_indicators) + len(expansion_signals)
-    if is_hiring:
-        signal_count += 1
-
-    if signal_count >= 4:
-        raw_score = 100
-    elif signal_count == 3:
-        raw_score = 80
-    elif signal_count == 2:
-        raw_score = 60
-    elif signal_count == 1:
-        raw_score = 40
-    else:
-        raw_score = 20
+    raw_score = GROWTH_SIGNAL_SCORES[min(signal_count, 4)]
 
     return {
         'raw_score': round(raw_score, 1),
         'weighted_score': round((raw_score * weight) / 100, 1),
         'weight': weight,
-        'value': {'is_hiring': is_hiring, 'signals': signal_count},
+        'value': {'is_hiring': features.is_hiring, 'signals': signal_count},
         'reasoning': f"Growth signals detected: {signal_count}"
     }
 
 
-def score_market_presence(data: Dict[str, Any], criteria: Dict[str, Any]) -> Dict[str, Any]:
+def score_market_presence(features: LeadFeatures, spec: ScoreSpec) -> Dict[str, Any]:
     """Score based on market presence and brand maturity."""
-    weight = criteria['weight']
-
-    presence = data.get('market_presence', {})
-    brand_maturity = presence.get('brand_maturity', 'unknown')
-    content_marketing = presence.get('content_marketing', False)
-    seo_quality = presence.get('seo_quality', 'poor')
-    social_activity = presence.get('social_media_activity', 'none')
-
-    score = 0
-    if brand_maturity == 'established':
-        score += 30
-    elif brand_maturity == 'growing':
-        score += 20
-
-    if content_marketing:
-        score += 20
-
-    if seo_quality in ['excellent', 'good']:
-        score += 25
-    elif seo_quality == 'average':
-        score += 15
-
-    if social_activity in ['active', 'moderate']:
-        score += 25
-    elif social_activity == 'minimal':
-        score += 10
+    weight = spec.market_weight
 
+    score = (
+        BRAND_MATURITY_SCORES.get(features.brand_maturity, 0)
+        + (CONTENT_MARKETING_SCORE if features.content_marketing else 0)
+        + SEO_QUALITY_SCORES.get(features.seo_quality, 0)
+        + SOCIAL_ACTIVITY_SCORES.get(features.social_activity, 0)
+    )
     raw_score = min(100, score)
 
     return {
@@ -649,12 +1263,12 @@ def score_market_presence(data: Dict[str, Any], criteria: Dict[str, Any]) -> Dic
         'weighted_score': round((raw_score * weight) / 100, 1),
         'weight': weight,
         'value': {
-            'brand_maturity': brand_maturity,
-            'content_marketing': content_marketing,
-            'seo_quality': seo_quality,
-            'social_activity': social_activity
+            'brand_maturity': features.brand_maturity,
+            'content_marketing': features.content_marketing,
+            'seo_quality': features.seo_quality,
+            'social_activity': features.social_activity
         },
-        'reasoning': f"Brand: {brand_maturity}, SEO: {seo_quality}, Social: {social_activity}"
+        'reasoning': f"Brand: {features.brand_maturity}, SEO: {features.seo_quality}, Social: {features.social_activity}"
     }
 
 
@@ -670,16 +1284,91 @@ def get_recommendation(category: str, score: float) -> str:
 
 
 # ============================================================================
-# INPUT/OUTPUT HANDLING
+# BATCH PROCESSING
 # ============================================================================
 
-def parse_arguments() -> Optional[Dict[str, str]]:
+def enrich_many(
+    domains: List[str],
+    icp_config: Dict[str, Any],
+    max_workers: int = MAX_WORKERS,
+    use_cache: bool = True
+) -> List[Dict[str, Any]]:
     """
-    Parse command line arguments.
+    Enrich and score several domains concurrently.
+
+    Domains with a cached enrichment skip both the fetch and Claude. The
+    rest are fetched on a thread pool, then enriched in batches of
+    ENRICH_BATCH_SIZE companies per Claude request (batches run concurrently).
+    If a batch reply cannot be used, its companies are enriched one by one.
+    A failure for one domain does not abort the batch.
+
+    Args:
+        domains: Company domains to enrich
+        icp_config: ICP configuration with criteria and weights
+        max_workers: Maximum number of concurrent requests per stage
+        use_cache: Read and write the on-disk page and enrichment caches
 
     Returns:
-        Dictionary with 'domain' and optional 'company', or None if reading from stdin
+        One report per domain, in input order. Failed domains are reported
+        as {'domain': ..., 'error': ...}
     """
+    if not domains:
+        return []
+
+    enriched: List[Any] = [
+        load_cached_enrichment(enrichment_cache_key(domain, icp_config)) if use_cache else None
+        for domain in domains
+    ]
+    pending = [index for index, enriched_data in enumerate(enriched) if enriched_data is None]
+
+    def enrich_chunk(chunk: List[Dict[str, Any]]) -> List[Any]:
+        try:
+            return enrich_company_data_batch(chunk, icp_config, use_cache=use_cache)
+        except Exception as e:
+            print(f"Warning: batch enrichment failed ({e}), retrying individually...", file=sys.stderr)
+
+        results = []
+        for company_data in chunk:
+            try:
+                results.append(enrich_company_data(company_data, icp_config, use_cache))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    if pending:
+        print(f"Fetching company data for {len(pending)} domains...", file=sys.stderr)
+        companies = fetch_many([domains[index] for index in pending], max_workers, use_cache)
+
+        print(f"Enriching {len(pending)} leads with AI...", file=sys.stderr)
+        chunks = [companies[i:i + ENRICH_BATCH_SIZE] for i in range(0, len(companies), ENRICH_BATCH_SIZE)]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            results = [item for chunk in executor.map(enrich_chunk, chunks) for item in chunk]
+        for index, enriched_data in zip(pending, results):
+            enriched[index] = enriched_data
+
+    print("Scoring leads against ICP criteria...", file=sys.stderr)
+    spec = build_score_spec(icp_config)
+    reports = []
+    for domain, enriched_data in zip(domains, enriched):
+        if isinstance(enriched_data, Exception):
+            reports.append({'domain': domain, 'error': str(enriched_data)})
+            continue
+        try:
+            scoring_results = score_lead(enriched_data, icp_config, spec)
+            reports.append(format_output(enriched_data, scoring_results, domain, None))
+        except Exception as e:
+            reports.append({'domain': domain, 'error': str(e)})
+
+    return reports
+
+
+# ============================================================================
+# INPUT/OUTPUT HANDLING
+# ============================================================================
+
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser once per process."""
     parser = argparse.ArgumentParser(
         description='Enrich company data and score leads against ICP criteria'
     )
@@ -693,12 +1382,41 @@ def parse_arguments() -> Optional[Dict[str, str]]:
         type=str,
         help='Company name (optional, will be detected if not provided)'
     )
+    parser.add_argument(
+        '--domains',
+        nargs='+',
+        help='Enrich several domains concurrently (batch mode)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore cached website fetches and enrichments'
+    )
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Indent the JSON output (default is compact)'
+    )
+    return parser
+
+
+def parse_arguments() -> Optional[Dict[str, Any]]:
+    """
+    Parse command line arguments.
 
+    Returns:
+        Dictionary with 'domain' and optional 'company' (or 'domains' for batch
+        mode) plus 'no_cache' and 'pretty', or None if reading from stdin
+    """
+    parser = _build_parser()
     args = parser.parse_args()
 
+    if args.domains:
+        return {'domains': args.domains, 'no_cache': args.no_cache, 'pretty': args.pretty}
+
     # If domain provided, return it
     if args.domain:
-        result = {'domain': args.domain}
+        result = {'domain': args.domain, 'no_cache': args.no_cache, 'pretty': args.pretty}
         if args.company:
             result['company'] = args.company
         return result
@@ -711,17 +1429,20 @@ def parse_arguments() -> Optional[Dict[str, str]]:
     sys.exit(1)
 
 
-def read_stdin_json() -> Dict[str, str]:
+def read_stdin_json() -> Dict[str, Any]:
     """
     Read JSON input from stdin (for Make.com webhook integration).
 
     Returns:
-        Dictionary with 'domain' and optional 'company'
+        Dictionary with 'domain' and optional 'company', or 'domains' for batch mode
     """
     try:
-        data = json.load(sys.stdin)
+        data = json_loads(sys.stdin.buffer.read())
 
-        if 'domain' not in data:
+        if 'domains' in data:
+            if not isinstance(data['domains'], list) or not data['domains']:
+                raise ValueError("'domains' must be a non-empty list")
+        elif 'domain' not in data:
             raise ValueError("JSON must contain 'domain' field")
 
         return data
@@ -749,7 +1470,7 @@ def format_output(
     """
     return {
         'enrichment_metadata': {
-            'timestamp': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+            'timestamp': _utc_iso(),
             'domain': domain,
             'company_name': company_name or enriched_data.get('company_profile', {}).get('name', 'Unknown'),
             'model_used': MODEL_NAME
@@ -781,6 +1502,22 @@ def main():
             # Read from stdin (Make.com mode)
             params = read_stdin_json()
 
+        use_cache = not params.get('no_cache', False)
+        pretty = params.get('pretty', False)
+
+        if 'domains' in params:
+            # Batch mode: enrich all domains in one invocation
+            print("Loading ICP configuration...", file=sys.stderr)
+            icp_config = load_icp_config()
+
+            results = enrich_many(params['domains'], icp_config, use_cache=use_cache)
+            write_json({'results': results}, indent=pretty)
+
+            failed = sum(1 for result in results if 'error' in result)
+            print("\n✓ Batch enrichment completed!", file=sys.stderr)
+            print(f"  Leads scored: {len(results) - failed}/{len(results)}", file=sys.stderr)
+            return
+
         domain = params['domain']
         company_name = params.get('company')
 
@@ -788,17 +1525,25 @@ def main():
         print(f"Loading ICP configuration...", file=sys.stderr)
         icp_config = load_icp_config()
 
-        # Step 3: Fetch company data
-        print(f"Fetching company data from {domain}...", file=sys.stderr)
-        company_data = fetch_company_data(domain, company_name)
+        # A cached enrichment skips both the website fetch and Claude
+        enriched_data = None
+        if use_cache:
+            enriched_data = load_cached_enrichment(enrichment_cache_key(domain, icp_config, company_name))
+
+        if enriched_data is not None:
+            print("Using cached enrichment...", file=sys.stderr)
+        else:
+            # Step 3: Fetch company data
+            print(f"Fetching company data from {domain}...", file=sys.stderr)
+            company_data = fetch_company_data(domain, company_name, use_cache=use_cache)
 
-        if 'error' in company_data:
-            print(f"Warning: {company_data['error']}", file=sys.stderr)
-            print("Continuing with limited data...", file=sys.stderr)
+            if 'error' in company_data:
+                print(f"Warning: {company_data['error']}", file=sys.stderr)
+                print("Continuing with limited data...", file=sys.stderr)
 
-        # Step 4: Enrich data using Claude
-        print(f"Enriching company data with AI...", file=sys.stderr)
-        enriched_data = enrich_company_data(company_data, icp_config)
+            # Step 4: Enrich data using Claude
+            print(f"Enriching company data with AI...", file=sys.stderr)
+            enriched_data = enrich_company_data(company_data, icp_config, use_cache, company_name)
 
         # Step 5: Score lead against ICP
         print(f"Scoring lead against ICP criteria...", file=sys.stderr)
@@ -812,8 +1557,8 @@ def main():
             company_name
         )
 
-        # Step 7: Output JSON to stdout
-        print(json.dumps(final_output, indent=2))
+        # Step 7: Output JSON to stdout (compact unless --pretty)
+        write_json(final_output, indent=pretty)
 
         # Show summary to stderr
         score = scoring_results['total_score']
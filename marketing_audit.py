@@ -10,20 +10,36 @@ Usage:
 
     # Make.com webhook mode (reads JSON from stdin)
     echo '{"url": "https://example.com", "industry": "SaaS"}' | python marketing_audit.py
+
+    # Batch mode (JSON Lines in, one compact JSON result per line out)
+    cat sites.jsonl | python marketing_audit.py
 """
 
 import os
 import sys
 import json
 import argparse
-import requests
+import functools
+import hashlib
+import tempfile
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Union, TYPE_CHECKING
 from dotenv import load_dotenv
-import anthropic
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 import time
 
+# requests, anthropic and bs4 are imported where they are used so that
+# --help, bad input and cached audits don't pay for loading them
+if TYPE_CHECKING:
+    import anthropic
+    import requests
+
+# orjson is optional; fall back to the stdlib parser when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -36,6 +52,131 @@ API_KEY = os.getenv('ANTHROPIC_API_KEY')
 MODEL_NAME = os.getenv('MODEL_NAME', 'claude-sonnet-4-5-20250929')
 MAX_TOKENS = int(os.getenv('MAX_TOKENS', '4096'))
 TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', '30'))
+MAX_PAGE_BYTES = int(os.getenv('MAX_PAGE_BYTES', str(256 * 1024)))
+CACHE_DIR = os.getenv('CACHE_DIR', '.cache')
+AUDIT_CACHE = os.getenv('AUDIT_CACHE', '1').lower() not in ('0', 'false', 'no')
+AUDIT_CACHE_TTL = 7 * 24 * 60 * 60  # 7 days
+MAX_WORKERS = int(os.getenv('MAX_WORKERS', '8'))
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+@functools.lru_cache(maxsize=None)
+def _get_session() -> 'requests.Session':
+    """
+    Shared HTTP session so repeat fetches reuse keep-alive connections.
+
+    Transient gateway errors (502/503/504) and connection failures are
+    retried twice with a short backoff, so a blip doesn't fail the audit.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=False,  # a 503 may ask for an hour-long wait
+        raise_on_status=False  # let raise_for_status() report the final response
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=8)
+
+    session = requests.Session()
+    session.headers.update({'User-Agent': USER_AGENT})
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+@functools.lru_cache(maxsize=None)
+def _get_client() -> 'anthropic.Anthropic':
+    """Shared Anthropic client so repeat audits reuse its connection pool."""
+    import anthropic
+    return anthropic.Anthropic(api_key=API_KEY)
+
+
+# ============================================================================
+# JSON HELPERS
+# ============================================================================
+
+def json_loads(data: Any) -> Any:
+    """Parse JSON from str or bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = True) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+
+def write_json(obj: Any, indent: bool = True) -> None:
+    """Write obj to stdout as JSON plus a newline, without building a joined copy."""
+    out = sys.stdout.buffer
+    out.write(json_dumps(obj, indent))
+    out.write(b'\n')
+    out.flush()
+
+
+def _utc_iso() -> str:
+    """Current UTC time as an ISO 8601 string with a Z suffix."""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+# ============================================================================
+# ON-DISK CACHE
+# ============================================================================
+
+def cache_key(*parts: str) -> str:
+    """Build a stable cache key from one or more strings."""
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+def cache_get(namespace: str, key: str, ttl: int) -> Optional[bytes]:
+    """
+    Read a cached entry if it exists and is younger than ttl seconds.
+
+    Args:
+        namespace: Cache subdirectory (e.g., 'audits')
+        key: Entry key from cache_key()
+        ttl: Maximum entry age in seconds
+
+    Returns:
+        Cached bytes, or None on a miss
+    """
+    path = os.path.join(CACHE_DIR, namespace, key)
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def cache_set(namespace: str, key: str, data: bytes) -> None:
+    """
+    Store a cache entry atomically. Failures are reported but never raised.
+
+    Args:
+        namespace: Cache subdirectory (e.g., 'audits')
+        key: Entry key from cache_key()
+        data: Bytes to store
+    """
+    directory = os.path.join(CACHE_DIR, namespace)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, os.path.join(directory, key))
+    except OSError as e:
+        print(f"Warning: Failed to write cache entry: {e}", file=sys.stderr)
 
 
 # ============================================================================
@@ -46,37 +187,71 @@ def fetch_website_content(url: str) -> Dict[str, Any]:
     """
     Fetch website content and extract key SEO elements.
 
+    Only the first MAX_PAGE_BYTES of the page are downloaded.
+
     Args:
         url: The website URL to analyze
 
     Returns:
         Dictionary containing page content, title, meta description, etc.
     """
+    import requests
+    from bs4 import BeautifulSoup
+
     try:
         # Ensure URL has protocol
         if not url.startswith(('http://', 'https://')):
             url = 'https://' + url
 
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-
-        response = requests.get(url, headers=headers, timeout=TIMEOUT)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        # Extract SEO elements
-        title = soup.find('title')
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        h1_tags = soup.find_all('h1')
-        h2_tags = soup.find_all('h2')
+        # Stream the body and stop at MAX_PAGE_BYTES; the audit only looks at
+        # the start of the page, so there is no point downloading the rest
+        with _get_session().get(url, timeout=TIMEOUT, stream=True) as response:
+            response.raise_for_status()
+            buf = bytearray()
+            for chunk in response.iter_content(chunk_size=16384):
+                buf.extend(chunk)
+                if len(buf) >= MAX_PAGE_BYTES:
+                    break
+
+        # lxml's C tokenizer is much faster than the pure-Python html.parser
+        soup = BeautifulSoup(bytes(buf[:MAX_PAGE_BYTES]), 'lxml')
+
+        # Extract SEO elements, link counts and page text in one walk over the tree
+        # rather than a separate find/find_all/get_text traversal for each.
+        # Text matches get_text(separator=' ', strip=True) but stops being
+        # collected once the 8000 character budget is filled.
+        title = None
+        meta_desc = None
+        h1_tags = []
+        h2_count = 0
+        internal_links_count = 0
+        text_parts = []
+        text_length = 0
+        text_types = soup.interesting_string_types  # skips comments, scripts, styles
+        for element in soup.descendants:
+            name = element.name  # None for text nodes
+            if name is None:
+                if text_length <= 8000 and type(element) in text_types:
+                    text = element.strip()
+                    if text:
+                        text_parts.append(text)
+                        text_length += len(text) + 1
+            elif name == 'a':
+                if element.get('href', '').startswith('/'):
+                    internal_links_count += 1
+            elif name == 'h1':
+                h1_tags.append(element)
+            elif name == 'h2':
+                h2_count += 1
+            elif name == 'title':
+                if title is None:
+                    title = element
+            elif name == 'meta':
+                if meta_desc is None and element.get('name') == 'description':
+                    meta_desc = element
 
         # Get text content (limited for API efficiency)
-        text_content = soup.get_text(separator=' ', strip=True)[:8000]
-
-        # Extract links for structure analysis
-        links = [a.get('href') for a in soup.find_all('a', href=True)]
+        text_content = ' '.join(text_parts)[:8000]
 
         return {
             'url': url,
@@ -84,9 +259,9 @@ def fetch_website_content(url: str) -> Dict[str, Any]:
             'meta_description': meta_desc.get('content') if meta_desc else None,
             'h1_count': len(h1_tags),
             'h1_tags': [h1.get_text(strip=True) for h1 in h1_tags[:5]],
-            'h2_count': len(h2_tags),
+            'h2_count': h2_count,
             'text_content': text_content,
-            'internal_links_count': len([l for l in links if l.startswith('/')]),
+            'internal_links_count': internal_links_count,
             'status_code': response.status_code,
             'load_time_seconds': response.elapsed.total_seconds()
         }
@@ -105,35 +280,20 @@ def fetch_website_content(url: str) -> Dict[str, Any]:
 # CLAUDE API INTEGRATION
 # ============================================================================
 
-def generate_marketing_audit(website_data: Dict[str, Any], industry: str) -> Dict[str, Any]:
-    """
-    Use Claude to generate a comprehensive marketing audit.
-
-    Args:
-        website_data: Data extracted from the website
-        industry: The company's industry/sector
-
-    Returns:
-        Structured audit findings as a dictionary
-    """
-    if not API_KEY:
-        raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
-
-    client = anthropic.Anthropic(api_key=API_KEY)
-
-    # Build the analysis prompt
-    prompt = f"""You are a senior marketing consultant conducting a comprehensive marketing audit.
+# Audit prompt, formatted once per call with the website data. Literal JSON
+# braces in the response schema are doubled for str.format.
+AUDIT_PROMPT_TEMPLATE = """You are a senior marketing consultant conducting a comprehensive marketing audit.
 
 COMPANY INFORMATION:
-- Website: {website_data['url']}
+- Website: {url}
 - Industry: {industry}
 
 WEBSITE DATA COLLECTED:
-- Page Title: {website_data.get('title', 'Not found')}
-- Meta Description: {website_data.get('meta_description', 'Not found')}
-- H1 Tags ({website_data.get('h1_count', 0)}): {website_data.get('h1_tags', [])}
-- Page Load Time: {website_data.get('load_time_seconds', 'N/A')} seconds
-- Website Content Sample: {website_data.get('text_content', '')[:4000]}
+- Page Title: {title}
+- Meta Description: {meta_description}
+- H1 Tags ({h1_count}): {h1_tags}
+- Page Load Time: {load_time} seconds
+- Website Content Sample: {content_sample}
 
 Please conduct a thorough marketing audit and provide your analysis in the following JSON structure:
 
@@ -216,6 +376,59 @@ Please conduct a thorough marketing audit and provide your analysis in the follo
 
 Provide ONLY the JSON output, no additional text. Be specific and actionable in your recommendations."""
 
+
+def audit_cache_key(website_data: Dict[str, Any], industry: str) -> Optional[str]:
+    """
+    Cache key for an audit, or None if it should not be cached.
+
+    The key covers the model, prompt template, industry and everything
+    extracted from the page except the load time, which varies on every
+    fetch. Audits of a failed website fetch are never cached.
+    """
+    if not AUDIT_CACHE or 'error' in website_data:
+        return None
+    page = {k: v for k, v in website_data.items() if k != 'load_time_seconds'}
+    return cache_key(MODEL_NAME, AUDIT_PROMPT_TEMPLATE, industry, json.dumps(page, sort_keys=True, default=str))
+
+
+def generate_marketing_audit(website_data: Dict[str, Any], industry: str) -> Dict[str, Any]:
+    """
+    Use Claude to generate a comprehensive marketing audit.
+
+    Results are cached on disk for AUDIT_CACHE_TTL, so re-auditing an
+    unchanged page skips the API call (set AUDIT_CACHE=0 to disable).
+
+    Args:
+        website_data: Data extracted from the website
+        industry: The company's industry/sector
+
+    Returns:
+        Structured audit findings as a dictionary
+    """
+    key = audit_cache_key(website_data, industry)
+    if key:
+        cached = cache_get('audits', key, AUDIT_CACHE_TTL)
+        if cached is not None:
+            return json_loads(cached)
+
+    if not API_KEY:
+        raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
+
+    import anthropic
+    client = _get_client()
+
+    # Build the analysis prompt
+    prompt = AUDIT_PROMPT_TEMPLATE.format(
+        url=website_data['url'],
+        industry=industry,
+        title=website_data.get('title', 'Not found'),
+        meta_description=website_data.get('meta_description', 'Not found'),
+        h1_count=website_data.get('h1_count', 0),
+        h1_tags=website_data.get('h1_tags', []),
+        load_time=website_data.get('load_time_seconds', 'N/A'),
+        content_sample=website_data.get('text_content', '')[:4000]
+    )
+
     try:
         # Call Claude API
         message = client.messages.create(
@@ -230,13 +443,16 @@ Provide ONLY the JSON output, no additional text. Be specific and actionable in
         response_text = message.content[0].text
 
         # Parse JSON from response
-        # Claude might wrap it in markdown code blocks, so clean that up
-        if '```json' in response_text:
-            response_text = response_text.split('```json')[1].split('```')[0].strip()
-        elif '```' in response_text:
-            response_text = response_text.split('```')[1].split('```')[0].strip()
-
-        audit_data = json.loads(response_text)
+        # Claude might wrap it in markdown code blocks or add a sentence around
+        # it, so keep only the span from the first '{' to the last '}'
+        start = response_text.find('{')
+        end = response_text.rfind('}')
+        if start != -1 and end > start:
+            response_text = response_text[start:end + 1]
+
+        audit_data = json_loads(response_text)
+        if key:
+            cache_set('audits', key, json_dumps(audit_data, indent=False))
         return audit_data
 
     except anthropic.APIError as e:
@@ -249,13 +465,9 @@ Provide ONLY the JSON output, no additional text. Be specific and actionable in
 # INPUT/OUTPUT HANDLING
 # ============================================================================
 
-def parse_arguments() -> Optional[Dict[str, str]]:
-    """
-    Parse command line arguments.
-
-    Returns:
-        Dictionary with 'url' and 'industry', or None if reading from stdin
-    """
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser once per process."""
     parser = argparse.ArgumentParser(
         description='Generate a comprehensive marketing audit using Claude AI'
     )
@@ -269,7 +481,17 @@ def parse_arguments() -> Optional[Dict[str, str]]:
         type=str,
         help='Company industry/sector (e.g., "SaaS", "E-commerce", "Healthcare")'
     )
+    return parser
+
+
+def parse_arguments() -> Optional[Dict[str, str]]:
+    """
+    Parse command line arguments.
 
+    Returns:
+        Dictionary with 'url' and 'industry', or None if reading from stdin
+    """
+    parser = _build_parser()
     args = parser.parse_args()
 
     # If both args provided, return them
@@ -288,25 +510,50 @@ def parse_arguments() -> Optional[Dict[str, str]]:
     sys.exit(1)
 
 
-def read_stdin_json() -> Dict[str, str]:
+def validate_input(data: Any) -> Dict[str, str]:
     """
-    Read JSON input from stdin (for Make.com webhook integration).
+    Check an input object and extract its 'url' and 'industry'.
+
+    Args:
+        data: Parsed JSON input
 
     Returns:
         Dictionary with 'url' and 'industry'
     """
-    try:
-        data = json.load(sys.stdin)
+    if not isinstance(data, dict) or 'url' not in data or 'industry' not in data:
+        raise ValueError("JSON must contain 'url' and 'industry' fields")
+
+    return {
+        'url': data['url'],
+        'industry': data['industry']
+    }
 
-        if 'url' not in data or 'industry' not in data:
-            raise ValueError("JSON must contain 'url' and 'industry' fields")
 
-        return {
-            'url': data['url'],
-            'industry': data['industry']
-        }
+def read_stdin_json() -> Union[Dict[str, str], List[Any]]:
+    """
+    Read JSON input from stdin (for Make.com webhook integration).
+
+    A single JSON object (pretty-printed or not) is validated and returned
+    as before. If the payload is not one JSON document but has several
+    lines, it is read as JSON Lines and the parsed objects are returned
+    unvalidated, so an entry missing fields doesn't fail the whole batch.
+
+    Returns:
+        Dictionary with 'url' and 'industry', or a list of inputs for batch mode
+    """
+    raw = sys.stdin.buffer.read()
+    try:
+        data = json_loads(raw)
     except json.JSONDecodeError as e:
-        raise ValueError(f"Invalid JSON input: {str(e)}")
+        lines = [line for line in raw.splitlines() if line.strip()]
+        if len(lines) < 2:
+            raise ValueError(f"Invalid JSON input: {str(e)}")
+        try:
+            return [json_loads(line) for line in lines]
+        except json.JSONDecodeError as line_error:
+            raise ValueError(f"Invalid JSON Lines input: {str(line_error)}")
+
+    return validate_input(data)
 
 
 def format_output(audit_results: Dict[str, Any], url: str, industry: str) -> Dict[str, Any]:
@@ -323,7 +570,7 @@ def format_output(audit_results: Dict[str, Any], url: str, industry: str) -> Dic
     """
     return {
         'audit_metadata': {
-            'timestamp': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+            'timestamp': _utc_iso(),
             'company_url': url,
             'industry': industry,
             'model_used': MODEL_NAME
@@ -332,6 +579,44 @@ def format_output(audit_results: Dict[str, Any], url: str, industry: str) -> Dic
     }
 
 
+# ============================================================================
+# BATCH PROCESSING
+# ============================================================================
+
+def audit_many(inputs: List[Any], max_workers: int = MAX_WORKERS) -> None:
+    """
+    Audit several sites concurrently and write one JSON result per line.
+
+    Results are written in input order as soon as each is ready. A failed
+    entry produces an {"input", "error"} line instead of stopping the batch.
+
+    Args:
+        inputs: Parsed JSON Lines entries, each with 'url' and 'industry'
+        max_workers: Maximum number of audits in flight
+    """
+    def audit_one(data: Any) -> Dict[str, Any]:
+        try:
+            params = validate_input(data)
+            print(f"Auditing {params['url']}...", file=sys.stderr)
+            website_data = fetch_website_content(params['url'])
+            audit_results = generate_marketing_audit(website_data, params['industry'])
+            return format_output(audit_results, params['url'], params['industry'])
+        except Exception as e:
+            return {'input': data, 'error': str(e)}
+
+    if API_KEY:
+        _get_client()  # build the shared client once, before the workers race for it
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(inputs))) as executor:
+        for result in executor.map(audit_one, inputs):
+            if 'error' in result:
+                failed += 1
+            write_json(result, indent=False)
+
+    print(f"\n✓ Batch audit completed: {len(inputs) - failed}/{len(inputs)} succeeded", file=sys.stderr)
+
+
 # ============================================================================
 # MAIN EXECUTION
 # ============================================================================
@@ -348,10 +633,16 @@ def main():
             # Read from stdin (Make.com mode)
             params = read_stdin_json()
 
+        if isinstance(params, list):
+            # JSON Lines batch: NDJSON output, one result per input line
+            audit_many(params)
+            return
+
         url = params['url']
         industry = params['industry']
 
-        # Step 2: Fetch website content
+        # Step 2: Fetch website content. The Anthropic client is only built
+        # on an audit cache miss, so cached audits never import anthropic
         print(f"Fetching website content from {url}...", file=sys.stderr)
         website_data = fetch_website_content(url)
 
@@ -367,7 +658,7 @@ def main():
         final_output = format_output(audit_results, url, industry)
 
         # Step 5: Output JSON to stdout
-        print(json.dumps(final_output, indent=2))
+        write_json(final_output)
 
         print("\n✓ Audit completed successfully!", file=sys.stderr)
 
@@ -16,36 +16,210 @@ Usage:
 
 import anthropic
 import argparse
+import functools
+import hashlib
 import json
 import os
 import sys
-import requests
-from bs4 import BeautifulSoup
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# orjson is optional; fall back to the stdlib serializer when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configuration
-ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
-MODEL_NAME = os.getenv("MODEL_NAME", "claude-sonnet-4-5-20250929")
-MAX_TOKENS = int(os.getenv("MAX_TOKENS", 4096))
-REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", 30))
+# Output budget for one combined multi-keyword analysis; kept below the
+# SDK's limit for non-streaming requests
+BATCH_MAX_TOKENS = 16000
+
+
+@functools.lru_cache(maxsize=None)
+def _env() -> Dict[str, Any]:
+    """
+    Load .env and read configuration on first use rather than at import.
+
+    Settings:
+        ANTHROPIC_API_KEY, MODEL_NAME, MAX_TOKENS, REQUEST_TIMEOUT
+        MAX_WORKERS: Concurrent per-keyword analyses when the combined
+            reply falls short
+        CACHE_DIR, ANALYSIS_CACHE, ANALYSIS_CACHE_TTL: On-disk cache for
+            bill analyses, so repeated tracking of an unchanged bill
+            (e.g. a 15-minute cron) skips the Claude call
+    """
+    load_dotenv()
+    return {
+        "ANTHROPIC_API_KEY": os.getenv("ANTHROPIC_API_KEY"),
+        "MODEL_NAME": os.getenv("MODEL_NAME", "claude-sonnet-4-5-20250929"),
+        "MAX_TOKENS": int(os.getenv("MAX_TOKENS", 4096)),
+        "REQUEST_TIMEOUT": int(os.getenv("REQUEST_TIMEOUT", 30)),
+        "MAX_WORKERS": int(os.getenv("MAX_WORKERS", 8)),
+        "CACHE_DIR": os.getenv("CACHE_DIR", ".cache"),
+        "ANALYSIS_CACHE": os.getenv("ANALYSIS_CACHE", "1").lower() not in ("0", "false", "no"),
+        "ANALYSIS_CACHE_TTL": int(os.getenv("ANALYSIS_CACHE_TTL", 900)),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _get_client() -> anthropic.Anthropic:
+    """Shared Anthropic client so every tracker reuses its connection pool."""
+    return anthropic.Anthropic(api_key=_env()["ANTHROPIC_API_KEY"])
+
 
 # Maryland General Assembly API/Website
 MGA_BASE_URL = "https://mgaleg.maryland.gov"
 MGA_API_BASE = f"{MGA_BASE_URL}/mgawebsite/Legislation"
 
+# Static analysis instructions, sent as a cached system block so repeated
+# analyses (e.g. monitor_keywords) reuse the prompt prefix; only the search
+# criteria and bill data in the user message change between calls.
+ANALYSIS_INSTRUCTIONS = """You are analyzing Maryland state legislation. Provide a comprehensive analysis of the bill(s) described in the user's message, which contains the SEARCH CRITERIA and BILL DATA.
+
+Please provide:
+
+1. EXECUTIVE SUMMARY: Brief overview of the bill(s) and their purpose
+
+2. KEY PROVISIONS: Main components and what the legislation does
+
+3. IMPACT ASSESSMENT:
+   - Who is affected (citizens, businesses, government)
+   - Potential benefits
+   - Potential concerns or challenges
+   - Fiscal impact if available
+
+4. STATUS & TIMELINE: Current legislative status and likely path forward
+
+5. STAKEHOLDER ANALYSIS: Who supports/opposes and why
+
+6. PRIORITY RATING: Rate importance as High/Medium/Low with justification
+
+7. MONITORING RECOMMENDATIONS: What to watch for as the bill progresses
+
+Provide analysis in structured JSON format."""
+
+# Fixed parts of the user messages as bytes, joined around the JSON bytes
+# of each request so the prompt is decoded once instead of per section
+_PROMPT_CRITERIA = b"SEARCH CRITERIA:\n"
+_PROMPT_BILLS = b"\n\nBILL DATA:\n"
+_KEYWORDS_PROMPT_PREFIX = b"""Analyze the bills found for each monitored keyword below separately.
+
+KEYWORD RESULTS:
+"""
+_KEYWORDS_PROMPT_SUFFIX = b"""
+
+Return ONLY a JSON object whose keys are exactly the keywords above and whose values are each keyword's analysis in structured JSON format."""
+
+# Demo keyword router: topic -> lowercase trigger terms, in priority order,
+# so a keyword that mentions several topics resolves to the first one listed.
+TOPIC_TERMS = {
+    "education": ("education", "school"),
+    "healthcare": ("healthcare", "health"),
+}
+
+
+def json_loads(data: Any) -> Any:
+    """Parse JSON from str or bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = True) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+
+def write_json(obj: Any, indent: bool = True) -> None:
+    """Write obj to stdout as JSON plus a newline, without building a joined copy."""
+    out = sys.stdout.buffer
+    out.write(json_dumps(obj, indent))
+    out.write(b"\n")
+    out.flush()
+
+
+def cache_key(*parts: str) -> str:
+    """Build a stable cache key from one or more strings."""
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def cache_get(namespace: str, key: str, ttl: int) -> Optional[bytes]:
+    """
+    Read a cached entry if it exists and is younger than ttl seconds.
+
+    Args:
+        namespace: Cache subdirectory (e.g., "bill_analyses")
+        key: Entry key from cache_key()
+        ttl: Maximum entry age in seconds
+
+    Returns:
+        Cached bytes, or None on a miss
+    """
+    path = os.path.join(_env()["CACHE_DIR"], namespace, key)
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def cache_set(namespace: str, key: str, data: bytes) -> None:
+    """
+    Store a cache entry atomically. Failures are reported but never raised.
+
+    Args:
+        namespace: Cache subdirectory (e.g., "bill_analyses")
+        key: Entry key from cache_key()
+        data: Bytes to store
+    """
+    directory = os.path.join(_env()["CACHE_DIR"], namespace)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, os.path.join(directory, key))
+    except OSError as e:
+        print(f"Warning: Failed to write cache entry: {e}", file=sys.stderr)
+
+
+def analysis_cache_key(bill_data: Dict, search_params: Dict) -> Optional[str]:
+    """
+    Cache key for a bill analysis, or None if caching is disabled.
+
+    The key covers the model, the search criteria and the bills, so a bill
+    whose status or text changes is analyzed again.
+    """
+    if not _env()["ANALYSIS_CACHE"]:
+        return None
+    return cache_key(
+        _env()["MODEL_NAME"],
+        json.dumps(search_params, sort_keys=True),
+        json.dumps(bill_data["bills"], sort_keys=True)
+    )
+
+
+def _should_stream() -> bool:
+    """Stream tokens only when they won't be repeated on the same terminal."""
+    return sys.stderr.isatty() and not sys.stdout.isatty()
+
 
 class MarylandBillTracker:
     """Track and analyze Maryland state legislation."""
 
     def __init__(self):
-        if not ANTHROPIC_API_KEY:
+        if not _env()["ANTHROPIC_API_KEY"]:
             raise ValueError("ANTHROPIC_API_KEY environment variable not set")
-        self.client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+        self.client = _get_client()
 
     def search_bills(self,
                     bill_number: Optional[str] = None,
@@ -67,12 +241,27 @@ class MarylandBillTracker:
             Dict containing bill information and analysis
         """
 
-        # If session not provided, use current year
+        search_params = self._build_search_params(bill_number, keyword, subject, session, status)
+
+        # Fetch bill data (simulation for demo - in production, use actual MGA API)
+        bill_data = self._fetch_bill_data(search_params)
+
+        # Analyze bill with Claude AI
+        analysis = self._analyze_bill_with_ai(bill_data, search_params)
+
+        return self._build_result(search_params, bill_data, analysis)
+
+    def _build_search_params(self,
+                             bill_number: Optional[str] = None,
+                             keyword: Optional[str] = None,
+                             subject: Optional[str] = None,
+                             session: Optional[str] = None,
+                             status: Optional[str] = None) -> Dict:
+        """Build search parameters, defaulting the session to the current year."""
         if not session:
             session = str(datetime.now().year)
 
-        # Build search parameters
-        search_params = {
+        return {
             "session": session,
             "bill_number": bill_number,
             "keyword": keyword,
@@ -80,19 +269,15 @@ class MarylandBillTracker:
             "status": status
         }
 
-        # Fetch bill data (simulation for demo - in production, use actual MGA API)
-        bill_data = self._fetch_bill_data(search_params)
-
-        # Analyze bill with Claude AI
-        analysis = self._analyze_bill_with_ai(bill_data, search_params)
-
+    def _build_result(self, search_params: Dict, bill_data: Dict, analysis: Dict) -> Dict:
+        """Assemble a search result from its criteria, bill data and AI analysis."""
         return {
             "search_criteria": search_params,
             "bills_found": bill_data.get("count", 0),
             "bills": bill_data.get("bills", []),
             "ai_analysis": analysis,
             "timestamp": datetime.now().isoformat(),
-            "session": session
+            "session": search_params["session"]
         }
 
     def _fetch_bill_data(self, params: Dict) -> Dict:
@@ -122,8 +307,13 @@ class MarylandBillTracker:
                 "url": f"{MGA_BASE_URL}/mgawebsite/Legislation/Details/{params['bill_number']}?ys={params['session']}"
             })
         elif params.get("keyword"):
-            keyword = params["keyword"].lower()
-            if "education" in keyword or "school" in keyword:
+            keyword_lower = params["keyword"].lower()
+            topic = next(
+                (topic for topic, terms in TOPIC_TERMS.items()
+                 if any(term in keyword_lower for term in terms)),
+                None
+            )
+            if topic == "education":
                 demo_bills.extend([
                     {
                         "bill_number": "HB101",
@@ -145,7 +335,7 @@ class MarylandBillTracker:
                         "committee": "Education Committee"
                     }
                 ])
-            elif "healthcare" in keyword or "health" in keyword:
+            elif topic == "healthcare":
                 demo_bills.append({
                     "bill_number": "HB205",
                     "title": "Maryland Healthcare Access Expansion",
@@ -169,60 +359,79 @@ class MarylandBillTracker:
             "session": params.get("session", str(datetime.now().year))
         }
 
-    def _analyze_bill_with_ai(self, bill_data: Dict, search_params: Dict) -> Dict:
-        """Use Claude AI to analyze bill impact and significance."""
-
-        if not bill_data.get("bills") or bill_data["count"] == 0:
-            return {
-                "summary": "No bills found to analyze",
-                "impact_assessment": None
-            }
-
-        # Prepare bill information for AI analysis
-        bills_text = json.dumps(bill_data["bills"], indent=2)
-
-        prompt = f"""You are analyzing Maryland state legislation. Provide a comprehensive analysis of the following bill(s):
-
-SEARCH CRITERIA:
-{json.dumps(search_params, indent=2)}
+    def _request_analysis(self, prompt: str, max_tokens: int, stream: bool = False) -> str:
+        """
+        Send an analysis prompt to Claude with the cached instruction block.
 
-BILL DATA:
-{bills_text}
+        Args:
+            prompt: User message with the search criteria and bill data
+            max_tokens: Output token budget
+            stream: Echo tokens to stderr as they arrive, so interactive
+                users see output before generation finishes
 
-Please provide:
+        Returns:
+            Claude's response text
+        """
+        request = {
+            "model": _env()["MODEL_NAME"],
+            "max_tokens": max_tokens,
+            "system": [{
+                "type": "text",
+                "text": ANALYSIS_INSTRUCTIONS,
+                "cache_control": {"type": "ephemeral"}
+            }],
+            "messages": [{
+                "role": "user",
+                "content": prompt
+            }]
+        }
 
-1. EXECUTIVE SUMMARY: Brief overview of the bill(s) and their purpose
+        if not stream:
+            return self.client.messages.create(**request).content[0].text
 
-2. KEY PROVISIONS: Main components and what the legislation does
+        with self.client.messages.stream(**request) as response:
+            for text in response.text_stream:
+                sys.stderr.write(text)
+                sys.stderr.flush()
+            message = response.get_final_message()
+        sys.stderr.write("\n")
+        return message.content[0].text
 
-3. IMPACT ASSESSMENT:
-   - Who is affected (citizens, businesses, government)
-   - Potential benefits
-   - Potential concerns or challenges
-   - Fiscal impact if available
+    def _analyze_bill_with_ai(self, bill_data: Dict, search_params: Dict,
+                              stream: Optional[bool] = None) -> Dict:
+        """
+        Use Claude AI to analyze bill impact and significance.
 
-4. STATUS & TIMELINE: Current legislative status and likely path forward
+        Analyses are cached on disk for ANALYSIS_CACHE_TTL seconds, so an
+        unchanged bill returns immediately (set ANALYSIS_CACHE=0 to disable).
+        When stderr is a terminal but stdout is redirected, the response is
+        streamed to stderr as it is generated; otherwise the final JSON on
+        stdout would repeat it, so the request stays buffered.
+        """
 
-5. STAKEHOLDER ANALYSIS: Who supports/opposes and why
+        if not bill_data.get("bills") or bill_data["count"] == 0:
+            return {
+                "summary": "No bills found to analyze",
+                "impact_assessment": None
+            }
 
-6. PRIORITY RATING: Rate importance as High/Medium/Low with justification
+        key = analysis_cache_key(bill_data, search_params)
+        if key:
+            cached = cache_get("bill_analyses", key, _env()["ANALYSIS_CACHE_TTL"])
+            if cached is not None:
+                return json_loads(cached)
 
-7. MONITORING RECOMMENDATIONS: What to watch for as the bill progresses
+        # Prepare bill information for AI analysis
+        prompt = b"".join((
+            _PROMPT_CRITERIA, json_dumps(search_params),
+            _PROMPT_BILLS, json_dumps(bill_data["bills"])
+        )).decode("utf-8")
 
-Provide analysis in structured JSON format."""
+        if stream is None:
+            stream = _should_stream()
 
         try:
-            message = self.client.messages.create(
-                model=MODEL_NAME,
-                max_tokens=MAX_TOKENS,
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }]
-            )
-
-            # Extract AI response
-            ai_response = message.content[0].text
+            ai_response = self._request_analysis(prompt, _env()["MAX_TOKENS"], stream)
 
             # Try to parse as JSON, fallback to text if not valid JSON
             try:
@@ -233,6 +442,8 @@ Provide analysis in structured JSON format."""
                     "format": "text"
                 }
 
+            if key:
+                cache_set("bill_analyses", key, json_dumps(analysis, indent=False))
             return analysis
 
         except Exception as e:
@@ -241,6 +452,94 @@ Provide analysis in structured JSON format."""
                 "raw_data": bill_data
             }
 
+    def _analyze_keywords_with_ai(self, searches: List[Tuple[Dict, Dict]]) -> List[Dict]:
+        """
+        Analyze the bills for several keyword searches in one Claude call.
+
+        Claude returns a JSON object keyed by keyword. Any keyword missing
+        from an unparseable or incomplete reply falls back to its own
+        _analyze_bill_with_ai call; those calls run concurrently.
+
+        Args:
+            searches: (search_params, bill_data) pairs, one per keyword
+
+        Returns:
+            Analysis for each search, in the same order
+        """
+        analyses: List[Optional[Dict]] = [None] * len(searches)
+        pending: Dict[str, Tuple[Dict, Dict]] = {}
+
+        for i, (search_params, bill_data) in enumerate(searches):
+            if not bill_data.get("bills") or bill_data["count"] == 0:
+                analyses[i] = {
+                    "summary": "No bills found to analyze",
+                    "impact_assessment": None
+                }
+            else:
+                key = analysis_cache_key(bill_data, search_params)
+                cached = cache_get("bill_analyses", key, _env()["ANALYSIS_CACHE_TTL"]) if key else None
+                if cached is not None:
+                    analyses[i] = json_loads(cached)
+                else:
+                    pending.setdefault(search_params["keyword"], (search_params, bill_data))
+
+        combined: Dict = {}
+        if len(pending) > 1:
+            keyword_data = {
+                keyword: {"search_criteria": search_params, "bills": bill_data["bills"]}
+                for keyword, (search_params, bill_data) in pending.items()
+            }
+            prompt = b"".join((
+                _KEYWORDS_PROMPT_PREFIX, json_dumps(keyword_data), _KEYWORDS_PROMPT_SUFFIX
+            )).decode("utf-8")
+
+            try:
+                ai_response = self._request_analysis(
+                    prompt,
+                    min(_env()["MAX_TOKENS"] * len(pending), BATCH_MAX_TOKENS),
+                    _should_stream()
+                )
+            except Exception as e:
+                error = f"AI analysis failed: {str(e)}"
+                return [
+                    analysis if analysis is not None else {"error": error, "raw_data": bill_data}
+                    for analysis, (_, bill_data) in zip(analyses, searches)
+                ]
+
+            # Claude may wrap the object in markdown fences; keep the outer braces
+            start, end = ai_response.find("{"), ai_response.rfind("}")
+            try:
+                parsed = json.loads(ai_response[start:end + 1]) if start != -1 else None
+            except json.JSONDecodeError:
+                parsed = None
+            if isinstance(parsed, dict):
+                combined = parsed
+
+        fallback = []
+        for i, (search_params, bill_data) in enumerate(searches):
+            if analyses[i] is None:
+                analysis = combined.get(search_params["keyword"])
+                if isinstance(analysis, dict):
+                    key = analysis_cache_key(bill_data, search_params)
+                    if key:
+                        cache_set("bill_analyses", key, json_dumps(analysis, indent=False))
+                    analyses[i] = analysis
+                else:
+                    fallback.append(i)
+
+        if fallback:
+            # The Anthropic client is thread-safe; map() keeps keyword order.
+            # Concurrent responses would interleave on stderr, so don't stream.
+            with ThreadPoolExecutor(max_workers=min(len(fallback), _env()["MAX_WORKERS"])) as executor:
+                fallback_analyses = executor.map(
+                    lambda i: self._analyze_bill_with_ai(searches[i][1], searches[i][0], stream=False),
+                    fallback
+                )
+                for i, analysis in zip(fallback, fallback_analyses):
+                    analyses[i] = analysis
+
+        return analyses
+
     def track_bill(self, bill_number: str, session: Optional[str] = None) -> Dict:
         """
         Track a specific bill and get detailed information.
@@ -258,6 +557,9 @@ Provide analysis in structured JSON format."""
         """
         Monitor multiple keywords and return matching bills.
 
+        Bills are fetched per keyword, then analyzed together in a single
+        Claude call rather than one round trip per keyword.
+
         Args:
             keywords: List of keywords to monitor
             session: Legislative session year
@@ -265,14 +567,20 @@ Provide analysis in structured JSON format."""
         Returns:
             Combined results for all keywords
         """
-        results = []
-
+        searches = []
         for keyword in keywords:
-            result = self.search_bills(keyword=keyword, session=session)
-            results.append({
+            search_params = self._build_search_params(keyword=keyword, session=session)
+            searches.append((search_params, self._fetch_bill_data(search_params)))
+
+        analyses = self._analyze_keywords_with_ai(searches)
+
+        results = [
+            {
                 "keyword": keyword,
-                "result": result
-            })
+                "result": self._build_result(search_params, bill_data, analysis)
+            }
+            for keyword, (search_params, bill_data), analysis in zip(keywords, searches, analyses)
+        ]
 
         return {
             "keywords_monitored": keywords,
@@ -285,10 +593,11 @@ def parse_stdin() -> Optional[Dict]:
     """Parse JSON input from stdin for automation workflows."""
     if not sys.stdin.isatty():
         try:
-            stdin_data = sys.stdin.read().strip()
-            if stdin_data:
-                return json.loads(stdin_data)
-        except json.JSONDecodeError as e:
+            # Parse the raw bytes directly rather than decoding and stripping a str copy
+            stdin_data = sys.stdin.buffer.read()
+            if stdin_data and not stdin_data.isspace():
+                return json_loads(stdin_data)
+        except ValueError as e:
             print(json.dumps({
                 "error": "Invalid JSON input",
                 "details": str(e)
@@ -328,7 +637,7 @@ def main():
             )
 
         # Output JSON result
-        print(json.dumps(result, indent=2))
+        write_json(result)
         return
 
     # CLI mode - parse arguments
@@ -382,7 +691,7 @@ Examples:
         )
 
     # Output result
-    print(json.dumps(result, indent=2))
+    write_json(result)
 
 
 if __name__ == "__main__":
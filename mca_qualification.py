@@ -7,25 +7,152 @@ AI-powered business loan qualification with compliance logging
 import json
 import sys
 import os
+import re
+import time
 import argparse
-from datetime import datetime
+import functools
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 import anthropic
 
-# Load environment variables
-load_dotenv()
+# orjson is optional; fall back to the stdlib json module when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # Configuration
-ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
-MODEL_NAME = os.getenv("MODEL_NAME", "claude-sonnet-4-5-20250929")
-MAX_TOKENS = int(os.getenv("MAX_TOKENS", "4096"))
+@functools.lru_cache(maxsize=None)
+def _env() -> Dict[str, Any]:
+    """Load .env and read configuration on first use rather than at import"""
+    load_dotenv()
+    return {
+        "ANTHROPIC_API_KEY": os.getenv("ANTHROPIC_API_KEY"),
+        "MODEL_NAME": os.getenv("MODEL_NAME", "claude-sonnet-4-5-20250929"),
+        "MAX_TOKENS": int(os.getenv("MAX_TOKENS", "4096")),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _get_client() -> anthropic.Anthropic:
+    """Shared Anthropic client so repeated qualifications reuse its connection pool"""
+    return anthropic.Anthropic(api_key=_env()["ANTHROPIC_API_KEY"])
+
 
 # Qualification thresholds
 MIN_REVENUE = 100000  # $100K annual revenue
 MIN_CREDIT_SCORE = 500
 MIN_BUSINESS_AGE_MONTHS = 6
 
+# Minimum policy gates, in decision_factors order:
+# (gate, decision factor, minimum, met text, failed text, red flag).
+# Texts are str.format templates over value, money (value as whole
+# dollars) and minimum.
+_MINIMUM_GATES = (
+    ("revenue", "revenue_assessment", MIN_REVENUE,
+     "Revenue of {money} meets minimum of ${minimum:,} annually",
+     "Revenue of {money} is below minimum threshold of ${minimum:,} annually",
+     "Revenue below minimum threshold"),
+    ("credit_score", "credit_assessment", MIN_CREDIT_SCORE,
+     "Credit score of {value} meets minimum requirement of {minimum}",
+     "Credit score of {value} is below minimum requirement of {minimum}",
+     "Credit score below acceptable range"),
+    ("business_age", "business_stability", MIN_BUSINESS_AGE_MONTHS,
+     "{value} months in operation meets minimum of {minimum} months",
+     "Only {value} months in operation, need minimum {minimum} months track record",
+     "Insufficient business operating history"),
+)
+
+# Markdown code fence around a JSON response; anchored to the whole
+# string so fences inside the JSON text are left alone
+_FENCE_RE = re.compile(r"^```(?:json)?|```$")
+
+# Underwriting prompt, filled with str.format in qualify_mca
+QUALIFICATION_PROMPT_TEMPLATE = """You are an MCA (Merchant Cash Advance) underwriter. Analyze this business application and provide a qualification decision.
+
+APPLICANT INFORMATION:
+- Company Name: {company_name}
+- Industry: {industry}
+- Annual Revenue: ${annual_revenue:,.2f}
+- Monthly Revenue (avg): ${monthly_avg:,.2f}
+- Credit Score: {credit_score}
+- Business Age: {business_age_months} months ({business_age_years:.1f} years)
+- Existing Debt: {debt_str}
+- Debt-to-Revenue Ratio: {debt_ratio:.1f}%
+{notes_line}
+QUALIFICATION CRITERIA:
+- Minimum Revenue: ${min_revenue:,}/year
+- Minimum Credit Score: {min_credit_score}
+- Minimum Business Age: {min_business_age_months} months
+- Maximum Debt Ratio: 50%
+
+TASK:
+Provide a comprehensive qualification analysis in the following JSON format:
+
+{{
+  "decision": "APPROVED" or "REJECTED",
+  "risk_level": "low" or "medium" or "high",
+  "recommended_advance_amount": {{
+    "min": 0,
+    "max": 0,
+    "recommended": 0
+  }},
+  "factor_payback_rate": 1.20,
+  "estimated_payback_months": 12,
+  "decision_factors": {{
+    "revenue_assessment": "Brief assessment of revenue strength",
+    "credit_assessment": "Brief assessment of credit profile",
+    "business_stability": "Brief assessment of business age/stability",
+    "industry_risk": "Brief industry-specific risk assessment",
+    "debt_burden": "Brief assessment of existing debt burden"
+  }},
+  "approval_conditions": ["Condition 1", "Condition 2"],
+  "red_flags": ["Any concerns or warnings"],
+  "underwriter_notes": "Additional context for decision"
+}}
+
+GUIDELINES:
+- Advance amount should be 10-50% of annual revenue for qualified applicants
+- Factor rates typically 1.15-1.35 based on risk
+- Payback typically 6-18 months
+- Be conservative but fair
+- Reject if below minimum thresholds
+- Consider industry-specific risks
+- Flag any concerning debt levels or credit issues
+
+Provide ONLY the JSON output, no other text."""
+
+
+def json_loads(data: Any) -> Any:
+    """Parse JSON from str or bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_json(obj: Any) -> None:
+    """Write obj to stdout as indented JSON plus a newline, using orjson when available"""
+    if orjson is not None:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(obj, indent=2).encode("utf-8")
+    out = sys.stdout.buffer
+    out.write(data)
+    out.write(b"\n")
+    out.flush()
+
+
+def _money(value: float) -> str:
+    """Format a dollar amount as whole dollars, e.g. $1,234"""
+    return f"${round(value):,}"
+
+
+def _utc_iso() -> str:
+    """Current UTC time as an ISO 8601 string with a Z suffix"""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
 
 def log_progress(message: str):
     """Log progress to stderr"""
@@ -72,6 +199,42 @@ def validate_inputs(data: Dict[str, Any]) -> tuple[bool, Optional[str]]:
     return True, None
 
 
+def _policy_rejection(gate_values: Dict[str, float], thresholds_met: Dict[str, bool]) -> Dict[str, Any]:
+    """Build the qualification result for an applicant below the minimum thresholds"""
+    not_assessed = "Not assessed - application is below minimum thresholds"
+
+    decision_factors = {
+        factor: (met_text if thresholds_met[gate] else failed_text).format(
+            value=gate_values[gate], money=_money(gate_values[gate]), minimum=minimum
+        )
+        for gate, factor, minimum, met_text, failed_text, _ in _MINIMUM_GATES
+    }
+    decision_factors["industry_risk"] = not_assessed
+    decision_factors["debt_burden"] = not_assessed
+
+    red_flags = [
+        red_flag
+        for gate, _, _, _, _, red_flag in _MINIMUM_GATES
+        if not thresholds_met[gate]
+    ]
+
+    return {
+        "decision": "REJECTED",
+        "risk_level": "high",
+        "recommended_advance_amount": {
+            "min": 0,
+            "max": 0,
+            "recommended": 0
+        },
+        "factor_payback_rate": 0,
+        "estimated_payback_months": 0,
+        "decision_factors": decision_factors,
+        "approval_conditions": [],
+        "red_flags": red_flags,
+        "underwriter_notes": "Application does not meet minimum qualification criteria. Decided by policy rules without AI review."
+    }
+
+
 def qualify_mca(
     company_name: str,
     annual_revenue: float,
@@ -88,115 +251,96 @@ def qualify_mca(
     Returns structured qualification decision with AI-powered analysis
     """
 
-    if not ANTHROPIC_API_KEY:
-        raise ValueError("ANTHROPIC_API_KEY not found in environment")
-
     log_progress(f"Qualifying: {company_name}")
-    log_progress(f"Revenue: ${annual_revenue:,.0f} | Credit: {credit_score} | Age: {business_age_months}mo")
-
-    # Initialize Anthropic client
-    client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+    log_progress(f"Revenue: {_money(annual_revenue)} | Credit: {credit_score} | Age: {business_age_months}mo")
 
     # Calculate derived metrics
     monthly_avg = monthly_revenue if monthly_revenue else annual_revenue / 12
     debt_ratio = (existing_debt / annual_revenue * 100) if existing_debt else 0
 
-    # Build qualification prompt
-    qualification_prompt = f"""You are an MCA (Merchant Cash Advance) underwriter. Analyze this business application and provide a qualification decision.
-
-APPLICANT INFORMATION:
-- Company Name: {company_name}
-- Industry: {industry}
-- Annual Revenue: ${annual_revenue:,.2f}
-- Monthly Revenue (avg): ${monthly_avg:,.2f}
-- Credit Score: {credit_score}
-- Business Age: {business_age_months} months ({business_age_months/12:.1f} years)
-- Existing Debt: ${existing_debt:,.2f if existing_debt else 0}
-- Debt-to-Revenue Ratio: {debt_ratio:.1f}%
-{f"- Additional Notes: {notes}" if notes else ""}
-
-QUALIFICATION CRITERIA:
-- Minimum Revenue: ${MIN_REVENUE:,}/year
-- Minimum Credit Score: {MIN_CREDIT_SCORE}
-- Minimum Business Age: {MIN_BUSINESS_AGE_MONTHS} months
-- Maximum Debt Ratio: 50%
-
-TASK:
-Provide a comprehensive qualification analysis in the following JSON format:
-
-{{
-  "decision": "APPROVED" or "REJECTED",
-  "risk_level": "low" or "medium" or "high",
-  "recommended_advance_amount": {{
-    "min": 0,
-    "max": 0,
-    "recommended": 0
-  }},
-  "factor_payback_rate": 1.20,
-  "estimated_payback_months": 12,
-  "decision_factors": {{
-    "revenue_assessment": "Brief assessment of revenue strength",
-    "credit_assessment": "Brief assessment of credit profile",
-    "business_stability": "Brief assessment of business age/stability",
-    "industry_risk": "Brief industry-specific risk assessment",
-    "debt_burden": "Brief assessment of existing debt burden"
-  }},
-  "approval_conditions": ["Condition 1", "Condition 2"],
-  "red_flags": ["Any concerns or warnings"],
-  "underwriter_notes": "Additional context for decision"
-}}
-
-GUIDELINES:
-- Advance amount should be 10-50% of annual revenue for qualified applicants
-- Factor rates typically 1.15-1.35 based on risk
-- Payback typically 6-18 months
-- Be conservative but fair
-- Reject if below minimum thresholds
-- Consider industry-specific risks
-- Flag any concerning debt levels or credit issues
-
-Provide ONLY the JSON output, no other text."""
-
-    log_progress("Analyzing qualification with AI...")
+    # Minimum policy gates; failing any one is a rejection no AI review can change
+    gate_values = {
+        "revenue": annual_revenue,
+        "credit_score": credit_score,
+        "business_age": business_age_months
+    }
+    thresholds_met = {
+        gate: gate_values[gate] >= minimum
+        for gate, _, minimum, _, _, _ in _MINIMUM_GATES
+    }
 
-    # Call Claude API
-    try:
-        message = client.messages.create(
-            model=MODEL_NAME,
-            max_tokens=MAX_TOKENS,
-            messages=[{
-                "role": "user",
-                "content": qualification_prompt
-            }]
+    if not all(thresholds_met.values()):
+        log_progress("Below minimum thresholds - rejecting without AI review")
+        qualification_data = _policy_rejection(gate_values, thresholds_met)
+        decision_source = "minimum_thresholds"
+    else:
+        # Only the AI path needs credentials; policy rejections never call Claude
+        if not _env()["ANTHROPIC_API_KEY"]:
+            raise ValueError("ANTHROPIC_API_KEY not found in environment")
+
+        # Build qualification prompt
+        debt_str = f"${existing_debt:,.2f}" if existing_debt else "$0.00"
+        notes_line = f"- Additional Notes: {notes}\n" if notes else ""
+        qualification_prompt = QUALIFICATION_PROMPT_TEMPLATE.format(
+            company_name=company_name,
+            industry=industry,
+            annual_revenue=annual_revenue,
+            monthly_avg=monthly_avg,
+            credit_score=credit_score,
+            business_age_months=business_age_months,
+            business_age_years=business_age_months / 12,
+            debt_str=debt_str,
+            debt_ratio=debt_ratio,
+            notes_line=notes_line,
+            min_revenue=MIN_REVENUE,
+            min_credit_score=MIN_CREDIT_SCORE,
+            min_business_age_months=MIN_BUSINESS_AGE_MONTHS
         )
 
-        # Extract and parse response
-        response_text = message.content[0].text.strip()
+        log_progress("Analyzing qualification with AI...")
 
-        # Remove markdown code blocks if present
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.startswith("```"):
-            response_text = response_text[3:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-
-        qualification_data = json.loads(response_text.strip())
+        # Call Claude API, streaming so the response is assembled as it generates
+        try:
+            started = time.monotonic()
+            chunks = []
+            with _get_client().messages.stream(
+                model=_env()["MODEL_NAME"],
+                max_tokens=_env()["MAX_TOKENS"],
+                messages=[{
+                    "role": "user",
+                    "content": qualification_prompt
+                }]
+            ) as stream:
+                for text in stream.text_stream:
+                    if not chunks:
+                        log_progress(f"First token after {time.monotonic() - started:.1f}s")
+                    chunks.append(text)
+
+            # Extract and parse response
+            response_text = "".join(chunks).strip()
+
+            # Remove markdown code blocks if present
+            response_text = _FENCE_RE.sub("", response_text).strip()
+
+            qualification_data = json.loads(response_text)
+
+        except json.JSONDecodeError as e:
+            log_progress(f"Failed to parse AI response: {e}")
+            raise
+        except Exception as e:
+            log_progress(f"API call failed: {e}")
+            raise
 
-    except json.JSONDecodeError as e:
-        log_progress(f"Failed to parse AI response: {e}")
-        raise
-    except Exception as e:
-        log_progress(f"API call failed: {e}")
-        raise
+        decision_source = "ai_underwriter"
 
-    # Build complete output
+    # Build complete output; one timestamp covers the whole decision
+    timestamp = _utc_iso()
     output = {
         "qualification_metadata": {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": timestamp,
             "company_name": company_name,
             "industry": industry,
-            "model_used": MODEL_NAME
+            "model_used": _env()["MODEL_NAME"]
         },
         "application_data": {
             "annual_revenue": annual_revenue,
@@ -208,13 +352,10 @@ Provide ONLY the JSON output, no other text."""
         },
         "qualification_result": qualification_data,
         "compliance_log": {
-            "minimum_thresholds_met": {
-                "revenue": annual_revenue >= MIN_REVENUE,
-                "credit_score": credit_score >= MIN_CREDIT_SCORE,
-                "business_age": business_age_months >= MIN_BUSINESS_AGE_MONTHS
-            },
-            "decision_timestamp": datetime.utcnow().isoformat() + "Z",
-            "model_version": MODEL_NAME
+            "minimum_thresholds_met": thresholds_met,
+            "decision_source": decision_source,
+            "decision_timestamp": timestamp,
+            "model_version": _env()["MODEL_NAME"]
         }
     }
 
@@ -229,16 +370,16 @@ def main():
     # Check if stdin has data (Make.com mode)
     if not sys.stdin.isatty():
         try:
-            input_data = json.load(sys.stdin)
+            input_data = json_loads(sys.stdin.buffer.read())
 
             # Validate inputs
             is_valid, error_msg = validate_inputs(input_data)
             if not is_valid:
                 error_output = {
                     "error": error_msg,
-                    "timestamp": datetime.utcnow().isoformat() + "Z"
+                    "timestamp": _utc_iso()
                 }
-                print(json.dumps(error_output, indent=2))
+                write_json(error_output)
                 sys.exit(1)
 
             # Run qualification
@@ -254,21 +395,21 @@ def main():
             )
 
             # Output JSON to stdout
-            print(json.dumps(result, indent=2))
+            write_json(result)
 
         except json.JSONDecodeError:
             error_output = {
                 "error": "Invalid JSON input",
-                "timestamp": datetime.utcnow().isoformat() + "Z"
+                "timestamp": _utc_iso()
             }
-            print(json.dumps(error_output, indent=2))
+            write_json(error_output)
             sys.exit(1)
         except Exception as e:
             error_output = {
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat() + "Z"
+                "timestamp": _utc_iso()
             }
-            print(json.dumps(error_output, indent=2))
+            write_json(error_output)
             sys.exit(1)
 
     else:
@@ -312,7 +453,7 @@ def main():
                 notes=args.notes
             )
 
-            print(json.dumps(result, indent=2))
+            write_json(result)
 
         except Exception as e:
             print(f"ERROR: {e}", file=sys.stderr)
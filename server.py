@@ -21,12 +21,18 @@ import os
 import sys
 import json
 import subprocess
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, Any, Tuple
 
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 
+# orjson is optional; fall back to the stdlib json module when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ============================================================================
 # FLASK APP CONFIGURATION
 # ============================================================================
@@ -58,6 +64,25 @@ PYTHON_CMD = VENV_PYTHON if os.path.exists(VENV_PYTHON) else sys.executable
 # HELPER FUNCTIONS
 # ============================================================================
 
+def json_loads(data: Any) -> Any:
+    """Parse JSON from str or bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def _utc_iso() -> str:
+    """Current UTC time as an ISO 8601 string with a Z suffix."""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
 def run_python_script(script_name: str, input_data: Dict[str, Any], timeout: int = 120) -> Tuple[Dict[str, Any], int]:
     """
     Run a Python script with JSON input via stdin.
@@ -76,16 +101,18 @@ def run_python_script(script_name: str, input_data: Dict[str, Any], timeout: int
     if not os.path.exists(script_path):
         return {
             'error': f'Script not found: {script_name}',
-            'timestamp': datetime.utcnow().isoformat() + 'Z'
+            'timestamp': _utc_iso()
         }, 500
 
     try:
-        # Convert input to JSON
-        input_json = json.dumps(input_data)
+        # Convert input to JSON bytes; the pipes stay binary so script
+        # output is parsed without a text-mode decode
+        input_json = json_dumps(input_data)
 
         # Log request (to stderr for production logging)
-        print(f"[{datetime.utcnow().isoformat()}] Running {script_name}", file=sys.stderr)
-        print(f"[{datetime.utcnow().isoformat()}] Input: {input_json}", file=sys.stderr)
+        started = _utc_iso()
+        print(f"[{started}] Running {script_name}", file=sys.stderr)
+        print(f"[{started}] Input: {input_json.decode('utf-8')}", file=sys.stderr)
 
         # Run script with JSON input via stdin
         process = subprocess.Popen(
@@ -93,16 +120,16 @@ def run_python_script(script_name: str, input_data: Dict[str, Any], timeout: int
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            cwd=SCRIPT_DIR,
-            text=True
+            cwd=SCRIPT_DIR
         )
 
         # Send input and get output
         stdout, stderr = process.communicate(input=input_json, timeout=timeout)
+        stderr = stderr.decode('utf-8', errors='replace')
 
         # Log stderr (script progress messages)
         if stderr:
-            print(f"[{datetime.utcnow().isoformat()}] Script stderr:\n{stderr}", file=sys.stderr)
+            print(f"[{_utc_iso()}] Script stderr:\n{stderr}", file=sys.stderr)
 
         # Check exit code
         if process.returncode != 0:
@@ -110,22 +137,22 @@ def run_python_script(script_name: str, input_data: Dict[str, Any], timeout: int
                 'error': f'Script execution failed with exit code {process.returncode}',
                 'script': script_name,
                 'stderr': stderr,
-                'timestamp': datetime.utcnow().isoformat() + 'Z'
+                'timestamp': _utc_iso()
             }, 500
 
         # Parse JSON output
         try:
-            result = json.loads(stdout)
-            print(f"[{datetime.utcnow().isoformat()}] {script_name} completed successfully", file=sys.stderr)
+            result = json_loads(stdout)
+            print(f"[{_utc_iso()}] {script_name} completed successfully", file=sys.stderr)
             return result, 200
 
-        except json.JSONDecodeError as e:
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
             return {
                 'error': 'Failed to parse script output as JSON',
                 'script': script_name,
                 'parse_error': str(e),
-                'stdout': stdout[:500],  # First 500 chars for debugging
-                'timestamp': datetime.utcnow().isoformat() + 'Z'
+                'stdout': stdout[:500].decode('utf-8', errors='replace'),  # First 500 bytes for debugging
+                'timestamp': _utc_iso()
             }, 500
 
     except subprocess.TimeoutExpired:
@@ -133,7 +160,7 @@ def run_python_script(script_name: str, input_data: Dict[str, Any], timeout: int
         return {
             'error': f'Script execution timed out after {timeout} seconds',
             'script': script_name,
-            'timestamp': datetime.utcnow().isoformat() + 'Z'
+            'timestamp': _utc_iso()
         }, 504
 
     except Exception as e:
@@ -141,7 +168,7 @@ def run_python_script(script_name: str, input_data: Dict[str, Any], timeout: int
             'error': f'Unexpected error running script: {str(e)}',
             'script': script_name,
             'error_type': type(e).__name__,
-            'timestamp': datetime.utcnow().isoformat() + 'Z'
+            'timestamp': _utc_iso()
         }, 500
 
 
@@ -155,7 +182,7 @@ def validate_json_request() -> Tuple[Dict[str, Any], int, bool]:
     if not request.is_json:
         return {
             'error': 'Content-Type must be application/json',
-            'timestamp': datetime.utcnow().isoformat() + 'Z'
+            'timestamp': _utc_iso()
         }, 400, False
 
     try:
@@ -163,14 +190,14 @@ def validate_json_request() -> Tuple[Dict[str, Any], int, bool]:
         if not data:
             return {
                 'error': 'Request body is empty',
-                'timestamp': datetime.utcnow().isoformat() + 'Z'
+                'timestamp': _utc_iso()
             }, 400, False
         return data, 200, True
 
     except Exception as e:
         return {
             'error': f'Invalid JSON: {str(e)}',
-            'timestamp': datetime.utcnow().isoformat() + 'Z'
+            'timestamp': _utc_iso()
         }, 400, False
 
 
@@ -184,7 +211,7 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'service': 'resultant-ai-api',
-        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'timestamp': _utc_iso(),
         'python_version': sys.version,
         'scripts_available': {
             'marketing_audit': os.path.exists(os.path.join(SCRIPT_DIR, 'marketing_audit.py')),
@@ -215,7 +242,7 @@ def audit():
         return jsonify({
             'error': 'Missing required fields. Expected: url, industry',
             'received_fields': list(data.keys()),
-            'timestamp': datetime.utcnow().isoformat() + 'Z'
+            'timestamp': _utc_iso()
         }), 400
 
     # Run script
@@ -233,6 +260,11 @@ def enrich():
         "domain": "stripe.com",
         "company": "Stripe" (optional)
     }
+
+    Or, for batch enrichment:
+    {
+        "domains": ["stripe.com", "shopify.com"]
+    }
     """
     # Validate request
     data, status, is_valid = validate_json_request()
@@ -240,15 +272,16 @@ def enrich():
         return jsonify(data), status
 
     # Validate required fields
-    if 'domain' not in data:
+    if 'domain' not in data and 'domains' not in data:
         return jsonify({
-            'error': 'Missing required field: domain',
+            'error': 'Missing required field: domain (or domains)',
             'received_fields': list(data.keys()),
-            'timestamp': datetime.utcnow().isoformat() + 'Z'
+            'timestamp': _utc_iso()
         }), 400
 
-    # Run script
-    result, status_code = run_python_script('lead_enrichment.py', data, timeout=90)
+    # Run script (batches get a longer timeout)
+    timeout = 300 if 'domains' in data else 90
+    result, status_code = run_python_script('lead_enrichment.py', data, timeout=timeout)
     return jsonify(result), status_code
 
 
@@ -283,7 +316,7 @@ def qualify():
             'error': f'Missing required fields: {", ".join(missing)}',
             'required_fields': required,
             'received_fields': list(data.keys()),
-            'timestamp': datetime.utcnow().isoformat() + 'Z'
+            'timestamp': _utc_iso()
         }), 400
 
     # Run script
@@ -319,7 +352,7 @@ def index():
                 'endpoint': '/enrich',
                 'description': 'Enrich company data and score against ICP criteria',
                 'required_fields': ['domain'],
-                'optional_fields': ['company'],
+                'optional_fields': ['company', 'domains'],
                 'example': {
                     'domain': 'stripe.com',
                     'company': 'Stripe'
@@ -354,7 +387,7 @@ def not_found(error):
         'error': 'Endpoint not found',
         'path': request.path,
         'method': request.method,
-        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'timestamp': _utc_iso(),
         'available_endpoints': ['GET /', 'GET /health', 'POST /audit', 'POST /enrich', 'POST /qualify']
     }), 404
 
@@ -366,7 +399,7 @@ def method_not_allowed(error):
         'error': 'Method not allowed',
         'path': request.path,
         'method': request.method,
-        'timestamp': datetime.utcnow().isoformat() + 'Z'
+        'timestamp': _utc_iso()
     }), 405
 
 
@@ -376,7 +409,7 @@ def internal_error(error):
     return jsonify({
         'error': 'Internal server error',
         'message': str(error),
-        'timestamp': datetime.utcnow().isoformat() + 'Z'
+        'timestamp': _utc_iso()
     }), 500
 
 